@@ -4,7 +4,11 @@ API module. Uses FastAPI.
 
 import os
 
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "project.settings")
+from project.settings.config import env_setting
+
+os.environ.setdefault(
+    "DJANGO_SETTINGS_MODULE", env_setting.django_settings_module
+)
 
 import django
 from django.core.handlers.asgi import ASGIHandler
@@ -29,10 +33,16 @@ from project.settings import (  # noqa: E402
     MEDIA_URL,
     STATIC_ROOT,
     STATIC_URL,
-    env_setting,
 )
+from project.utils.metrics import registry  # noqa: E402
 
 from api.common import api_description  # noqa: E402
+from api.health import router as health_router  # noqa: E402
+from api.lifespan import lifespan  # noqa: E402
+from api.metrics import (  # noqa: E402
+    collect_component_stats,
+    router as metrics_router,
+)
 from api.middleware import register_middlewares  # noqa: E402
 from api.v1 import router as v1_router  # noqa: E402
 
@@ -47,6 +57,7 @@ fastapi = FastAPI(
     docs_url=f"{env_setting.API_PREFIX}/docs",
     redoc_url=f"{env_setting.API_PREFIX}/redoc",
     openapi_url=f"{env_setting.API_PREFIX}/openapi.json",
+    lifespan=lifespan,
 )
 
 app = register_middlewares(fastapi)
@@ -66,8 +77,18 @@ async def echo_health() -> dict:
     return {}
 
 
-# Mount django for admin & account creation views ie. /d/admin & /d/user/* etc
-app.mount(env_setting.DJANGO_PREFIX, app=ASGIHandler(), name="django")
+app.include_router(health_router)
+
+
+if env_setting.METRICS_ENABLED:
+    registry.add_collector(collect_component_stats)
+    app.include_router(metrics_router)
+
+
+if not env_setting.API_ONLY:
+    # Mount django for admin & account creation views ie. /d/admin & /d/user/*
+    # CORS is handled for it by the API's middleware
+    app.mount(env_setting.DJANGO_PREFIX, app=ASGIHandler(), name="django")
 
 if FRONTEND_DIR:
     index_file_content = (FRONTEND_DIR / "index.html").read_text()
@@ -1,4 +1,49 @@
+import os
+
+import typer
 from fastapi_cli.cli import app
 
+
+@app.command("startup-report")
+def startup_report(
+    top: int = typer.Option(15, help="Number of packages & modules listed"),
+):
+    """Breaks down the time spent importing & setting up the api"""
+    from project.utils.startup import measure_startup
+
+    print(measure_startup().format(top))
+
+
+@app.command("serve")
+def serve(
+    host: str = typer.Option("127.0.0.1", help="Address to bind to"),
+    port: int = typer.Option(8000, help="Port to bind to"),
+    workers: int = typer.Option(
+        os.cpu_count() or 1, help="Number of worker processes"
+    ),
+    max_requests: int = typer.Option(
+        0, help="Requests after which a worker is replaced. 0 for never"
+    ),
+    max_requests_jitter: int = typer.Option(
+        0, help="Up to this many requests are added to --max-requests"
+    ),
+):
+    """Serves the api with pre-forked workers sharing the preloaded app"""
+    if not hasattr(os, "fork"):
+        raise typer.BadParameter("Pre-forking needs a POSIX system")
+
+    from api import app as api_app
+    from api.server import PreforkServer
+
+    PreforkServer(
+        api_app,
+        host=host,
+        port=port,
+        workers=workers,
+        max_requests=max_requests,
+        max_requests_jitter=max_requests_jitter,
+    ).run()
+
+
 if __name__ == "__main__":
     app()
@@ -0,0 +1,218 @@
+"""
+Sliding-window rate limiting for unauthenticated endpoints.
+
+Requests are limited per client IP and, separately, per identity (e.g.
+username) taken from the query string or form body. Limited requests are
+rejected with `429` and a `Retry-After` header before the route does any
+work.
+"""
+
+import math
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+
+from django.core.cache import caches
+from fastapi import HTTPException, Request, status
+from project.settings import env_setting
+
+RATE_PATTERN = re.compile(
+    r"^\s*(\d+)\s*/\s*(\d*)\s*(second|minute|hour|day)s?\s*$"
+)
+
+PERIOD_SECONDS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+def parse_rate(rate: str) -> tuple[int, int]:
+    """Parses rate such as `10/minute` or `100/5minutes` to
+    (limit, window in seconds)"""
+    match = RATE_PATTERN.match(rate)
+    if not match:
+        raise ValueError(f"Invalid rate limit - {rate!r}")
+    limit, multiplier, period = match.groups()
+    return int(limit), int(multiplier or 1) * PERIOD_SECONDS[period]
+
+
+class MemoryRateLimitBackend:
+    """Exact sliding-window log kept in the worker's memory. Each scope keeps
+    at most `max_keys` keys, the least recently hit are evicted first"""
+
+    def __init__(self, max_keys: int = 10_000):
+        self.max_keys = max_keys
+        self._scopes: dict[str, OrderedDict[str, deque[float]]] = {}
+        self._lock = threading.Lock()
+
+    async def hit(
+        self, scope: str, key: str, limit: int, window: int
+    ) -> float | None:
+        """Records a hit. Returns seconds to wait when limit is exceeded"""
+        now = time.monotonic()
+        with self._lock:
+            keys = self._scopes.setdefault(scope, OrderedDict())
+            hits = keys.pop(key, None)
+            if hits is None:
+                hits = deque()
+            keys[key] = hits
+            while hits and hits[0] <= now - window:
+                hits.popleft()
+
+            if len(hits) >= limit:
+                return hits[0] + window - now
+
+            hits.append(now)
+            self._evict(keys, now - window)
+            return None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._scopes.clear()
+
+    def _evict(self, keys: OrderedDict[str, deque[float]], since: float):
+        # Keys of a scope share its window, the least recently hit expire
+        # first
+        while keys:
+            hits = next(iter(keys.values()))
+            if len(keys) <= self.max_keys and hits and hits[-1] > since:
+                break
+            keys.popitem(last=False)
+
+
+class CacheRateLimitBackend:
+    """Sliding-window counter stored in a Django cache.
+
+    Shared across workers when the cache is (e.g. database, file-based,
+    redis). The current and previous fixed windows are weighted to
+    approximate a sliding window. Hits are counted using the cache's
+    `add` & `incr` so that concurrent workers don't undercount them.
+    """
+
+    key_prefix = "rate-limit"
+    version_key = f"{key_prefix}:version"
+    """Holds the version of hit counters, bumped by `clear`"""
+
+    def __init__(self, alias: str = "default"):
+        self.alias = alias
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    async def hit(
+        self, scope: str, key: str, limit: int, window: int
+    ) -> float | None:
+        now = time.time()
+        current_window, elapsed = divmod(now, window)
+        key = f"{self.key_prefix}:{scope}:{key}"
+        current_key = f"{key}:{int(current_window)}"
+        previous_key = f"{key}:{int(current_window) - 1}"
+        version = await self.cache.aget(self.version_key, 1)
+
+        await self.cache.aadd(
+            current_key, 0, timeout=window * 2, version=version
+        )
+        try:
+            current = await self.cache.aincr(current_key, version=version)
+        except ValueError:
+            # Expired in between
+            current = 1
+            await self.cache.aset(
+                current_key, current, timeout=window * 2, version=version
+            )
+        previous = await self.cache.aget(previous_key, 0, version=version)
+
+        previous_weight = (window - elapsed) / window
+        if previous * previous_weight + current > limit:
+            # Rejected hits don't count
+            try:
+                await self.cache.adecr(current_key, version=version)
+            except ValueError:
+                pass
+            return window - elapsed
+        return None
+
+    def clear(self) -> None:
+        """Forgets recorded hits. Leaves other entries of the cache intact"""
+        try:
+            self.cache.incr(self.version_key)
+        except ValueError:
+            self.cache.set(self.version_key, 2, timeout=None)
+
+
+RateLimitBackend = MemoryRateLimitBackend | CacheRateLimitBackend
+
+
+def get_rate_limit_backend() -> RateLimitBackend:
+    if env_setting.RATE_LIMIT_BACKEND == "cache":
+        return CacheRateLimitBackend(env_setting.RATE_LIMIT_CACHE_ALIAS)
+    return MemoryRateLimitBackend()
+
+
+rate_limit_backend = get_rate_limit_backend()
+
+
+class RateLimiter:
+    """Dependency that rate limits requests per client IP and, with
+    `identity_field`, per identity. `ip_rate` defaults to `rate`
+
+    #### Usage
+
+    ```python
+    @router.post(
+        "/token",
+        dependencies=[Depends(RateLimiter("token", "10/minute", "username"))],
+    )
+    async def fetch_token(...):
+    ...
+    """
+
+    def __init__(
+        self,
+        scope: str,
+        rate: str,
+        identity_field: str | None = None,
+        ip_rate: str | None = None,
+        backend: RateLimitBackend | None = None,
+    ):
+        self.scope = scope
+        self.limit, self.window = parse_rate(rate)
+        self.ip_limit, self.ip_window = parse_rate(ip_rate or rate)
+        self.identity_field = identity_field
+        self.backend = backend
+
+    async def get_identity(self, request: Request) -> str:
+        identity = request.query_params.get(self.identity_field)
+        if identity is None and request.headers.get(
+            "content-type", ""
+        ).startswith(
+            ("application/x-www-form-urlencoded", "multipart/form-data")
+        ):
+            identity = (await request.form()).get(self.identity_field)
+        return str(identity or "").strip().lower()
+
+    async def __call__(self, request: Request) -> None:
+        if not env_setting.RATE_LIMIT_ENABLED:
+            return
+
+        backend = self.backend or rate_limit_backend
+        # Clients rotating identities are limited by IP, and the other way
+        # around
+        retry_after = await backend.hit(
+            f"{self.scope}:ip",
+            request.client.host if request.client else "",
+            self.ip_limit,
+            self.ip_window,
+        )
+        if retry_after is None and self.identity_field:
+            retry_after = await backend.hit(
+                f"{self.scope}:identity",
+                await self.get_identity(request),
+                self.limit,
+                self.window,
+            )
+        if retry_after is not None:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests. Try again later.",
+                headers={"Retry-After": str(max(math.ceil(retry_after), 1))},
+            )
@@ -6,9 +6,10 @@ Reference: https://developers.cloudflare.com/turnstile/get-started/server-side-v
 
 import re
 
-import httpx
 from fastapi import HTTPException, Request, status
 from project.settings import env_setting
+from project.utils.http_clients import http_clients
+from project.utils.telemetry import measure
 
 from ._types import TurnstileVerificationResponse
 from .exceptions import InvalidSecretError
@@ -18,6 +19,8 @@ VERIFICATION_URL = "https://challenges.cloudflare.com/turnstile/v0/siteverify"
 
 EXCLUDED_REMOTE_ADDR_PATTERN = re.compile(r"^(192\.168\.|10\.|127\.)")
 
+http_clients.register("turnstile")
+
 
 class TurnstileToken:
     """Extracts turnstile token from request `json/form`"""
@@ -67,12 +70,11 @@ async def validate_turnstile_token(
     if not EXCLUDED_REMOTE_ADDR_PATTERN.match(remote_ip):
         payload["remote_ip"] = remote_ip
 
-    async_client = httpx.AsyncClient()
-
-    resp = await async_client.post(
-        VERIFICATION_URL,
-        data=payload,
-    )
+    with measure("http"):
+        resp = await http_clients.get("turnstile").post(
+            VERIFICATION_URL,
+            data=payload,
+        )
 
     if auto_error:
         if resp.status_code == status.HTTP_400_BAD_REQUEST:
@@ -0,0 +1,178 @@
+"""Warmup of workers & their health checks.
+
+A worker is live as soon as it serves requests and ready once `warm_up`
+has opened its db connection, rendered the email templates, loaded the
+username index and filled the response cache. The auth-token cache fills
+up on use. Signed tokens aren't stored, so there is nothing to load it
+from.
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import httpx
+from asgiref.sync import sync_to_async
+from django.db import connection
+from django.template import engines
+from fastapi import APIRouter, FastAPI, status
+from fastapi.responses import JSONResponse
+from project.settings import env_setting
+from users.cache import user_token_cache, username_index
+
+from api.routing import response_cache
+
+logger = logging.getLogger(__name__)
+
+WARMUP_ROUTES = (
+    "Business information",
+    "Business galleries",
+    "Customers' feedback",
+    "Frequently asked questions",
+)
+"""Names of GET routes requested on warmup, filling the response cache"""
+
+router = APIRouter(prefix="/health")
+
+
+@dataclass
+class WarmupState:
+    ready: bool = False
+    steps_ms: dict[str, float] = field(default_factory=dict)
+    failed_steps: list[str] = field(default_factory=list)
+
+
+@dataclass
+class DatabasePing:
+    latency_ms: float | None = None
+    reachable: bool = False
+    checked_at: float = float("-inf")
+
+
+warmup_state = WarmupState()
+database_ping = DatabasePing()
+
+
+def warm_templates(prefix: str = "api/v1") -> int:
+    """Renders templates of the api so that they're compiled & cached"""
+    warmed = 0
+    for engine in engines.all():
+        for directory in getattr(engine, "template_dirs", ()):
+            directory = Path(directory)
+            for path in (directory / prefix).rglob("*.html"):
+                template_name = path.relative_to(directory).as_posix()
+                engine.get_template(template_name).render({})
+                warmed += 1
+    return warmed
+
+
+async def prime_responses(app: FastAPI) -> None:
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://warmup"
+    ) as client:
+        for name in WARMUP_ROUTES:
+            await client.get(app.url_path_for(name))
+
+
+async def warm_up(app: FastAPI) -> None:
+    """Runs the warmup steps then marks the worker ready. Failed steps are
+    logged, they would fail the same way on first use"""
+    steps = (
+        ("database", sync_to_async(connection.ensure_connection)),
+        ("templates", sync_to_async(warm_templates)),
+        ("username_index", username_index.aload),
+        ("response_cache", lambda: prime_responses(app)),
+    )
+    for name, step in steps:
+        started = time.perf_counter()
+        try:
+            await step()
+        except Exception:
+            logger.exception("Warmup step %s failed", name)
+            warmup_state.failed_steps.append(name)
+        warmup_state.steps_ms[name] = round(
+            (time.perf_counter() - started) * 1000, 3
+        )
+
+    warmup_state.ready = True
+    logger.info("Warmed up in %sms", sum(warmup_state.steps_ms.values()))
+
+
+def ping_database() -> None:
+    started = time.perf_counter()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+    except Exception:
+        # Details stay in the logs, the check is public
+        logger.exception("Database ping failed")
+        database_ping.latency_ms = None
+        database_ping.reachable = False
+    else:
+        database_ping.latency_ms = round(
+            (time.perf_counter() - started) * 1000, 3
+        )
+        database_ping.reachable = True
+    database_ping.checked_at = time.monotonic()
+
+
+def cache_fill() -> dict[str, dict]:
+    token_cache = user_token_cache.stats()
+    index = username_index.stats()
+    return {
+        "responses": {
+            "size": len(response_cache),
+            "maxsize": response_cache.maxsize,
+        },
+        "auth_token": {
+            "size": token_cache["size"],
+            "maxsize": token_cache["maxsize"],
+        },
+        "username_index": {
+            "size": index["size"],
+            "loaded": username_index.loaded_at is not None,
+        },
+    }
+
+
+@router.get("/live", name="Check API liveness")
+async def check_liveness() -> dict:
+    """Answers as long as the worker serves requests"""
+    return {}
+
+
+@router.get("/ready", name="Check API readiness")
+async def check_readiness(deep: bool = False) -> JSONResponse:
+    """`503` until the worker is warmed up. `deep` adds the db latency,
+    pinged at most every `HEALTH_DB_PING_TTL` seconds, & cache fill levels
+    """
+    content = {"ready": warmup_state.ready}
+    if deep:
+        if (
+            time.monotonic() - database_ping.checked_at
+            > env_setting.HEALTH_DB_PING_TTL
+        ):
+            await sync_to_async(ping_database)()
+
+        content.update(
+            warmup={
+                "steps_ms": warmup_state.steps_ms,
+                "failed_steps": warmup_state.failed_steps,
+            },
+            database={
+                "latency_ms": database_ping.latency_ms,
+                "reachable": database_ping.reachable,
+            },
+            caches=cache_fill(),
+        )
+        content["ready"] = warmup_state.ready and database_ping.reachable
+
+    return JSONResponse(
+        content,
+        status_code=(
+            status.HTTP_200_OK
+            if content["ready"]
+            else status.HTTP_503_SERVICE_UNAVAILABLE
+        ),
+    )
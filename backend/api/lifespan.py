@@ -0,0 +1,76 @@
+"""Startup & shutdown of the API"""
+
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+
+from asgiref.sync import sync_to_async
+from fastapi import FastAPI
+from project.settings import env_setting
+from project.utils.http_clients import http_clients
+from project.utils.log import start_queue_listeners, stop_queue_listeners
+from project.utils.metrics import registry
+from users.cache import username_index
+from users.models import AuthToken
+
+from api.health import warm_up, warmup_state
+
+logger = logging.getLogger(__name__)
+
+
+async def run_periodically(interval: float, func, *args):
+    """Calls sync `func` off the event loop every `interval` seconds"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await sync_to_async(func)(*args)
+        except Exception:
+            logger.exception("Periodic task %s failed", func.__qualname__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    start_queue_listeners()
+    http_clients.open()
+
+    background_tasks = []
+    if env_setting.WARMUP_ENABLED:
+        # Requests are served meanwhile, `/health/ready` tells when done
+        background_tasks.append(asyncio.create_task(warm_up(app)))
+    else:
+        await username_index.aload()
+        warmup_state.ready = True
+
+    if env_setting.AUTH_TOKEN_SWEEP_INTERVAL:
+        background_tasks.append(
+            asyncio.create_task(
+                run_periodically(
+                    env_setting.AUTH_TOKEN_SWEEP_INTERVAL,
+                    AuthToken.delete_expired,
+                )
+            )
+        )
+
+    if env_setting.METRICS_ENABLED and env_setting.METRICS_DIR:
+        os.makedirs(env_setting.METRICS_DIR, exist_ok=True)
+        background_tasks.append(
+            asyncio.create_task(
+                run_periodically(
+                    env_setting.METRICS_FLUSH_INTERVAL,
+                    registry.write_snapshot,
+                    env_setting.METRICS_DIR,
+                )
+            )
+        )
+
+    yield
+
+    for task in background_tasks:
+        task.cancel()
+
+    if env_setting.METRICS_ENABLED and env_setting.METRICS_DIR:
+        registry.write_snapshot(env_setting.METRICS_DIR)
+
+    await http_clients.aclose()
+    stop_queue_listeners()
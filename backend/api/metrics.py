@@ -0,0 +1,109 @@
+"""Metrics of API components & their endpoint. `collect_component_stats`
+refreshes them"""
+
+import hmac
+from typing import Annotated
+
+from asgiref.sync import sync_to_async
+from fastapi import APIRouter, Header, HTTPException, status
+from fastapi.responses import PlainTextResponse
+from project.settings import env_setting
+from project.utils.http_clients import http_clients
+from project.utils.metrics import Counter, registry, render_prometheus
+from users.cache import user_token_cache, username_index
+
+from api.v1.account.hashing import password_hasher
+
+cache_entries = registry.gauge(
+    "cache_entries", "Entries held by in-process caches", ("cache",)
+)
+cache_lookups = registry.counter(
+    "cache_lookups_total",
+    "Lookups made on in-process caches",
+    ("cache", "result"),
+)
+password_hasher_tasks = registry.gauge(
+    "password_hasher_tasks", "Password hashing tasks by state", ("state",)
+)
+password_hasher_rejected = registry.counter(
+    "password_hasher_rejected_total",
+    "Password hashing tasks rejected for the pool being saturated",
+)
+http_client_connections = registry.gauge(
+    "http_client_connections",
+    "Pooled connections of outbound http clients by state",
+    ("client", "state"),
+)
+http_client_connection_limit = registry.gauge(
+    "http_client_connection_limit",
+    "Most connections an outbound http client may open",
+    ("client",),
+)
+
+_reported_totals: dict[tuple, float] = {}
+
+
+def report_total(counter: Counter, *labels, total: float) -> None:
+    """Increments `counter` by how much `total`, a count kept by a
+    component, grew since last reported"""
+    key = (counter.name, *labels)
+    reported = _reported_totals.get(key, 0)
+    _reported_totals[key] = total
+    if total < reported:
+        # The component was reset
+        reported = 0
+    counter.inc(*labels, amount=total - reported)
+
+
+def collect_component_stats() -> None:
+    token_cache = user_token_cache.stats()
+    cache_entries.set("auth_token", value=token_cache["size"])
+    report_total(cache_lookups, "auth_token", "hit", total=token_cache["hits"])
+    report_total(
+        cache_lookups, "auth_token", "miss", total=token_cache["misses"]
+    )
+
+    index = username_index.stats()
+    cache_entries.set("username_index", value=index["size"])
+    report_total(
+        cache_lookups,
+        "username_index",
+        "memory",
+        total=index["lookups"] - index["db_lookups"],
+    )
+    report_total(
+        cache_lookups, "username_index", "db", total=index["db_lookups"]
+    )
+
+    hasher = password_hasher.stats()
+    password_hasher_tasks.set("pending", value=hasher["pending"])
+    password_hasher_tasks.set("queued", value=hasher["queue_depth"])
+    report_total(password_hasher_rejected, total=hasher["rejected"])
+
+    for client, pool in http_clients.stats().items():
+        for state in ("active", "idle"):
+            http_client_connections.set(client, state, value=pool[state])
+        if pool["limit"] is not None:
+            http_client_connection_limit.set(client, value=pool["limit"])
+
+
+router = APIRouter(include_in_schema=False)
+
+
+@router.get(env_setting.METRICS_PATH, name="Export metrics")
+async def export_metrics(
+    authorization: Annotated[str | None, Header()] = None,
+) -> PlainTextResponse:
+    """Metrics in Prometheus text format. Scrapers authenticate using
+    `METRICS_TOKEN` as bearer token when it is set"""
+    if env_setting.METRICS_TOKEN and not hmac.compare_digest(
+        (authorization or "").encode(),
+        f"Bearer {env_setting.METRICS_TOKEN}".encode(),
+    ):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+
+    metrics = await sync_to_async(registry.collect)(env_setting.METRICS_DIR)
+    return PlainTextResponse(
+        render_prometheus(metrics),
+        media_type="text/plain; version=0.0.4",
+    )
@@ -0,0 +1,61 @@
+"""ASGI middlewares of the app.
+
+They are plain ASGI callables rather than `@app.middleware("http")`
+functions. Starlette's `BaseHTTPMiddleware`, which backs the decorator,
+runs the app in a separate task and pipes the response body through a
+memory stream, costing throughput and breaking streaming responses.
+"""
+
+from fastapi import FastAPI
+from project.settings import env_setting
+from project.utils.telemetry import install_query_timer
+
+from api.middleware.compression import CompressionMiddleware
+from api.middleware.cors import CachedCORSMiddleware
+from api.middleware.observability import ObservabilityMiddleware
+from api.middleware.profiling import ProfilingMiddleware
+from api.middleware.request_id import RequestIdMiddleware
+from api.middleware.slow_requests import SlowRequestMiddleware
+
+
+def register_middlewares(app: FastAPI) -> FastAPI:
+    # Add your middlewares here. The last added wraps the others
+
+    app.add_middleware(
+        CachedCORSMiddleware,
+        allow_origins=env_setting.cors_allowed_origins,
+        allow_credentials=env_setting.CORS_ALLOW_CREDENTIALS,
+        allow_methods=env_setting.CORS_ALLOW_METHODS,
+        allow_headers=env_setting.CORS_ALLOW_HEADERS,
+        allow_origin_regexes=env_setting.CORS_ALLOWED_ORIGIN_REGEXES,
+        max_age=env_setting.CORS_PREFLIGHT_MAX_AGE,
+    )
+
+    if env_setting.COMPRESSION_ENABLED:
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=env_setting.COMPRESSION_MINIMUM_SIZE,
+            levels={
+                "gzip": env_setting.COMPRESSION_GZIP_LEVEL,
+                "br": env_setting.COMPRESSION_BROTLI_QUALITY,
+                "zstd": env_setting.COMPRESSION_ZSTD_LEVEL,
+            },
+        )
+
+    install_query_timer()
+
+    if env_setting.PROFILING_ENABLED:
+        app.add_middleware(ProfilingMiddleware)
+
+    if env_setting.SLOW_REQUEST_THRESHOLD:
+        app.add_middleware(
+            SlowRequestMiddleware,
+            threshold=env_setting.SLOW_REQUEST_THRESHOLD,
+            sample_interval=env_setting.SLOW_REQUEST_SAMPLE_INTERVAL,
+            keep=env_setting.SLOW_REQUEST_REPORTS_KEPT,
+        )
+
+    app.add_middleware(ObservabilityMiddleware)
+    app.add_middleware(RequestIdMiddleware)
+
+    return app
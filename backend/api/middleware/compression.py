@@ -0,0 +1,237 @@
+"""Response compression negotiated from `Accept-Encoding`.
+
+gzip is always available. brotli and zstd are used when the `brotli` and
+`zstandard` packages are installed (zstd also from the standard library
+since Python 3.14).
+"""
+
+import zlib
+from functools import lru_cache
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    from compression import zstd
+except ImportError:
+    zstd = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSIBLE_TYPES = {
+    "application/javascript",
+    "application/json",
+    "application/manifest+json",
+    "application/wasm",
+    "application/xml",
+    "image/svg+xml",
+}
+
+
+def is_compressible(content_type: str | None) -> bool:
+    """Text-like media. Images, archives & the like are compressed already"""
+    if not content_type:
+        return False
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return (
+        media_type.startswith("text/")
+        or media_type.endswith(("+json", "+xml"))
+        or media_type in COMPRESSIBLE_TYPES
+    )
+
+
+class GzipCompressor:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH
+        )
+
+
+class BrotliCompressor:
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        return self._compressor.process(data) + (
+            self._compressor.finish() if final else self._compressor.flush()
+        )
+
+
+class ZstdCompressor:
+    def __init__(self, level: int):
+        if zstd is not None:
+            self._compressor = zstd.ZstdCompressor(level=level)
+            self._flush_modes = (
+                zstd.ZstdCompressor.FLUSH_BLOCK,
+                zstd.ZstdCompressor.FLUSH_FRAME,
+            )
+        else:
+            self._compressor = zstandard.ZstdCompressor(
+                level=level
+            ).compressobj()
+            self._flush_modes = (
+                zstandard.COMPRESSOBJ_FLUSH_BLOCK,
+                zstandard.COMPRESSOBJ_FLUSH_FINISH,
+            )
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            self._flush_modes[final]
+        )
+
+
+Compressor = GzipCompressor | BrotliCompressor | ZstdCompressor
+
+COMPRESSORS: dict[str, type[Compressor]] = {"gzip": GzipCompressor}
+if zstd is not None or zstandard is not None:
+    COMPRESSORS["zstd"] = ZstdCompressor
+if brotli is not None:
+    COMPRESSORS["br"] = BrotliCompressor
+
+PREFERENCE = ("zstd", "br", "gzip")
+"""Order in which encodings the client values equally are picked"""
+
+
+@lru_cache(maxsize=256)
+def choose_encoding(accept_encoding: str) -> str | None:
+    """Best available encoding accepted by the client, if any"""
+    qualities: dict[str, float] = {}
+    for entry in accept_encoding.lower().split(","):
+        coding, _, params = entry.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        if coding:
+            qualities[coding.strip()] = quality
+
+    wildcard = qualities.get("*", 0.0)
+    candidates = [
+        (qualities.get(coding, wildcard), -rank, coding)
+        for rank, coding in enumerate(PREFERENCE)
+        if coding in COMPRESSORS
+    ]
+    quality, _, coding = max(candidates)
+    return coding if quality > 0 else None
+
+
+class CompressionMiddleware:
+    """Compresses text-like responses of at least `minimum_size` bytes.
+
+    Responses sent in one piece are compressed whole. Streaming ones are
+    compressed & flushed chunk by chunk so nothing gets buffered.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 500,
+        levels: dict[str, int] | None = None,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = {"gzip": 6, "br": 4, "zstd": 3, **(levels or {})}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(
+            Headers(scope=scope).get("accept-encoding", "")
+        )
+        # Wrapped even without an accepted encoding, shared caches must be
+        # told that the response varies by `Accept-Encoding`
+        responder = CompressionResponder(
+            send,
+            encoding,
+            self.levels.get(encoding),
+            self.minimum_size,
+        )
+        await self.app(scope, receive, responder.send)
+
+
+class CompressionResponder:
+    def __init__(
+        self,
+        send: Send,
+        encoding: str | None,
+        level: int | None,
+        minimum_size,
+    ):
+        self._send = send
+        self.encoding = encoding
+        self.level = level
+        self.minimum_size = minimum_size
+        self.start_message: Message | None = None
+        self.compressor: Compressor | None = None
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Held until the first body chunk tells whether to compress
+            self.start_message = message
+            return
+
+        if self.start_message is None:
+            if self.compressor is not None:
+                message["body"] = self.compressor.compress(
+                    message.get("body", b""),
+                    final=not message.get("more_body", False),
+                )
+            await self._send(message)
+            return
+
+        start_message, self.start_message = self.start_message, None
+        if message["type"] != "http.response.body":
+            # e.g. http.response.pathsend, the server sends the file itself
+            await self._send(start_message)
+            await self._send(message)
+            return
+
+        headers = MutableHeaders(scope=start_message)
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        compressible = is_compressible(headers.get("content-type"))
+        if compressible:
+            headers.add_vary_header("Accept-Encoding")
+
+        if (
+            not compressible
+            or self.encoding is None
+            or "content-encoding" in headers
+            or "content-range" in headers
+            or start_message["status"] in (204, 206, 304)
+            or (not more_body and len(body) < self.minimum_size)
+        ):
+            await self._send(start_message)
+            await self._send(message)
+            return
+
+        self.compressor = COMPRESSORS[self.encoding](self.level)
+        headers["Content-Encoding"] = self.encoding
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            # Compressed bytes differ from those the strong tag identifies
+            headers["ETag"] = f"W/{etag}"
+
+        message["body"] = self.compressor.compress(body, final=not more_body)
+        if more_body:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(len(message["body"]))
+
+        await self._send(start_message)
+        await self._send(message)
@@ -0,0 +1,34 @@
+"""CORS for both the API and the mounted django app"""
+
+from functools import lru_cache
+
+from starlette.middleware.cors import CORSMiddleware
+from starlette.types import ASGIApp
+
+
+def merge_regexes(regexes: list[str]) -> str | None:
+    """Single alternation matching whatever any of `regexes` matches"""
+    if not regexes:
+        return None
+    return "|".join(f"(?:{regex})" for regex in regexes)
+
+
+class CachedCORSMiddleware(CORSMiddleware):
+    """`CORSMiddleware` accepting several origin regexes, compiled into one
+    pattern, and remembering its latest origin decisions"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        allow_origin_regexes: list[str] = (),
+        origin_cache_size: int = 1024,
+        **kwargs,
+    ):
+        super().__init__(
+            app,
+            allow_origin_regex=merge_regexes(allow_origin_regexes),
+            **kwargs,
+        )
+        self.is_allowed_origin = lru_cache(maxsize=origin_cache_size)(
+            self.is_allowed_origin
+        )
@@ -0,0 +1,133 @@
+"""Per-request telemetry: Server-Timing, access log, metrics & N+1 reports"""
+
+import json
+import logging
+
+from project.settings import env_setting
+from project.utils.log import request_id
+from project.utils.metrics import (
+    db_queries,
+    db_query_duration,
+    http_request_duration,
+    http_requests,
+    http_requests_in_progress,
+)
+from project.utils.telemetry import (
+    RequestTelemetry,
+    notify_observers,
+    request_telemetry,
+)
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+access_logger = logging.getLogger("api.access")
+query_logger = logging.getLogger("api.queries")
+
+
+def route_label(scope: Scope) -> str:
+    """Path template of the matched route. Keeps metric labels few"""
+    return getattr(scope.get("route"), "path", None) or "unmatched"
+
+
+def record_metrics(
+    scope: Scope, status_code: int, telemetry: RequestTelemetry
+) -> None:
+    method, route = scope["method"], route_label(scope)
+    http_requests.inc(method, route, status_code)
+    http_request_duration.observe(
+        method, route, value=telemetry.duration_ns / 1e9
+    )
+    if telemetry.query_count:
+        db_queries.inc(method, route, amount=telemetry.query_count)
+        db_query_duration.inc(
+            method, route, amount=telemetry.phases["db"] / 1e9
+        )
+
+
+class ObservabilityMiddleware:
+    """Breaks request duration down into auth, db, serialize & http phases.
+    Sent as `Server-Timing` header, written to the json access log and
+    recorded in the metrics registry.
+
+    Queries run repeatedly are reported as likely N+1. In debug mode query
+    counts are also sent as `X-DB-*` headers. Headers reflect the time taken
+    until the response starts, logs & metrics the whole request.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        telemetry = RequestTelemetry()
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", telemetry.server_timing())
+                if env_setting.DEBUG:
+                    headers.append(
+                        "X-DB-Query-Count", str(telemetry.query_count)
+                    )
+                    headers.append(
+                        "X-DB-Repeated-Queries",
+                        str(
+                            sum(
+                                telemetry.repeated_queries(
+                                    env_setting.N_PLUS_ONE_THRESHOLD
+                                ).values()
+                            )
+                        ),
+                    )
+            await send(message)
+
+        token = request_telemetry.set(telemetry)
+        http_requests_in_progress.inc(scope["method"])
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            request_telemetry.reset(token)
+            http_requests_in_progress.dec(scope["method"])
+            telemetry.finish()
+            record_metrics(scope, status_code, telemetry)
+            notify_observers(telemetry)
+            self.report(scope, status_code, telemetry)
+
+    def report(
+        self, scope: Scope, status_code: int, telemetry: RequestTelemetry
+    ) -> None:
+        for shape, count in telemetry.repeated_queries(
+            env_setting.N_PLUS_ONE_THRESHOLD
+        ).items():
+            query_logger.warning(
+                "Possible N+1 on %s %s - query ran %d times: %s",
+                scope["method"],
+                scope["path"],
+                count,
+                shape,
+            )
+
+        if access_logger.isEnabledFor(logging.INFO):
+            client = scope.get("client")
+            access_logger.info(
+                json.dumps(
+                    {
+                        "request_id": request_id.get(),
+                        "client": client[0] if client else None,
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "route": getattr(scope.get("route"), "name", None),
+                        "user_id": telemetry.user_id,
+                        "status": status_code,
+                        "duration_ms": round(telemetry.duration_ns / 1e6, 3),
+                        "queries": telemetry.query_count,
+                        "phases_ms": telemetry.phases_ms(),
+                    }
+                )
+            )
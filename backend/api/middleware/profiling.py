@@ -0,0 +1,80 @@
+"""Profiles requests carrying a valid profiling token"""
+
+import logging
+import threading
+import uuid
+
+from asgiref.sync import sync_to_async
+from project.utils.profiling import (
+    get_profiler,
+    read_profiling_token,
+    write_report,
+)
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+profiling_logger = logging.getLogger("api.profiling")
+
+
+class ProfilingMiddleware:
+    """Runs requests sent with `X-Profile: sample|cprofile` and a valid
+    `X-Profile-Token` under the profiler. Its report id is sent as
+    `X-Profile-Id` and the report written once the response is complete.
+
+    One request is profiled at a time, others are served normally.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._lock = threading.Lock()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        kind = headers.get("X-Profile")
+        token = headers.get("X-Profile-Token")
+        if not (kind and token):
+            await self.app(scope, receive, send)
+            return
+
+        issued_by = read_profiling_token(token)
+        profiler = get_profiler(kind)
+        if issued_by is None or profiler is None:
+            profiling_logger.warning(
+                "Ignored profiling request with invalid token or profiler %r",
+                kind,
+            )
+            await self.app(scope, receive, send)
+            return
+
+        if not self._lock.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex
+
+        async def send_with_profile_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("X-Profile-Id", profile_id)
+            await send(message)
+
+        try:
+            profiler.start()
+            try:
+                await self.app(scope, receive, send_with_profile_id)
+            finally:
+                profiler.stop()
+            path = await sync_to_async(write_report)(profiler, profile_id)
+        finally:
+            self._lock.release()
+
+        profiling_logger.info(
+            "Profiled %s %s for %s - %s",
+            scope["method"],
+            scope["path"],
+            issued_by,
+            path,
+        )
@@ -0,0 +1,41 @@
+"""Request ids for correlating logs"""
+
+import re
+import uuid
+
+from project.utils.log import request_id
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+REQUEST_ID_PATTERN = re.compile(r"^[\w.:-]{1,128}$", re.ASCII)
+
+
+class RequestIdMiddleware:
+    """Uses the client's `X-Request-ID` when well formed, otherwise
+    generates one. It is sent back in the response and added to logs"""
+
+    header = "X-Request-ID"
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        value = Headers(scope=scope).get(self.header)
+        if value is None or not REQUEST_ID_PATTERN.match(value):
+            value = uuid.uuid4().hex
+        scope.setdefault("state", {})["request_id"] = value
+
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append(self.header, value)
+            await send(message)
+
+        token = request_id.set(value)
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id.reset(token)
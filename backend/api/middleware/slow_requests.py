@@ -0,0 +1,245 @@
+"""Reports requests that take longer than their slow-request threshold.
+
+While a request is past its threshold, a watchdog thread samples the stacks
+of the task serving it, of the event loop's thread (catching sync code that
+blocks the loop) and of the thread last running its queries (catching slow
+sync code run through `sync_to_async` such as signal handlers). Once done,
+the report is logged, kept in a ring buffer and saved for the admin.
+"""
+
+import asyncio
+import contextvars
+import json
+import logging
+import sys
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+
+from asgiref.sync import sync_to_async
+from management.models import SlowRequestReport
+from project.settings import env_setting
+from project.utils.log import request_id
+from project.utils.telemetry import RequestTelemetry, request_telemetry
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+slow_request_logger = logging.getLogger("api.slow_requests")
+
+recent_reports: deque[dict] = deque(
+    maxlen=env_setting.SLOW_REQUEST_REPORTS_KEPT
+)
+"""Latest reports of this process, newest last"""
+
+
+def route_threshold(scope: Scope, default: float) -> float:
+    """Seconds set using `slow_request_threshold` on the route, if any"""
+    endpoint = getattr(scope.get("route"), "endpoint", None)
+    return getattr(endpoint, "slow_request_threshold", None) or default
+
+
+def format_stack(frame, limit: int = 64) -> list[str]:
+    """Outermost first"""
+    stack = []
+    while frame is not None and len(stack) < limit:
+        code = frame.f_code
+        stack.append(f"{code.co_name} ({code.co_filename}:{frame.f_lineno})")
+        frame = frame.f_back
+    return stack[::-1]
+
+
+@dataclass(eq=False)
+class InFlightRequest:
+    scope: Scope
+    telemetry: RequestTelemetry
+    task: asyncio.Task | None
+    loop_thread_id: int
+    samples: Counter[str] = field(default_factory=Counter)
+
+    def sample(self, threads: dict[int, object]) -> None:
+        if self.task is not None:
+            # Frames of the coroutines awaiting, outermost first
+            stack = [
+                f"{frame.f_code.co_name} "
+                f"({frame.f_code.co_filename}:{frame.f_lineno})"
+                for frame in self.task.get_stack()
+            ]
+            self._add("task", stack)
+
+        for label, thread_id in (
+            ("event-loop", self.loop_thread_id),
+            ("sync", self.telemetry.sync_thread_id),
+        ):
+            frame = threads.get(thread_id)
+            if frame is not None:
+                self._add(label, format_stack(frame))
+
+    def _add(self, label: str, stack: list[str]) -> None:
+        if stack:
+            self.samples[";".join([label, *stack]).replace("\n", " ")] += 1
+
+
+class SlowRequestWatchdog:
+    """Thread sampling stacks of requests past their threshold"""
+
+    def __init__(self, threshold: float, interval: float):
+        self.threshold = threshold
+        self.interval = interval
+        self.requests: set[InFlightRequest] = set()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def watch(self, request: InFlightRequest) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run,
+                        name="slow-request-watchdog",
+                        daemon=True,
+                    )
+                    self._thread.start()
+        with self._lock:
+            self.requests.add(request)
+
+    def forget(self, request: InFlightRequest) -> None:
+        with self._lock:
+            self.requests.discard(request)
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            now = time.perf_counter_ns()
+            with self._lock:
+                slow = [
+                    request
+                    for request in self.requests
+                    if now - request.telemetry.started_ns
+                    > route_threshold(request.scope, self.threshold) * 1e9
+                ]
+            if not slow:
+                continue
+            threads = sys._current_frames()
+            for request in slow:
+                try:
+                    request.sample(threads)
+                except Exception:
+                    # The task's frames may change while being walked
+                    pass
+
+
+def build_report(
+    request: InFlightRequest, status_code: int, threshold: float
+) -> dict:
+    scope, telemetry = request.scope, request.telemetry
+    return {
+        "method": scope["method"],
+        "path": scope["path"],
+        "route": getattr(scope.get("route"), "name", None),
+        "status_code": status_code,
+        "duration_ms": round(telemetry.duration_ns / 1e6, 3),
+        "threshold_ms": threshold * 1000,
+        "user_id": telemetry.user_id,
+        "request_id": request_id.get(),
+        "params": {
+            "path": {
+                name: str(value)
+                for name, value in scope.get("path_params", {}).items()
+            },
+            "query": scope.get("query_string", b"").decode("latin-1"),
+        },
+        "queries": [
+            [sql, round(duration_ns / 1e6, 3)]
+            for sql, duration_ns in telemetry.queries or []
+        ],
+        "stack_samples": "\n".join(
+            f"{stack} {count}" for stack, count in request.samples.most_common()
+        ),
+    }
+
+
+class SlowRequestMiddleware:
+    """Reports requests taking longer than `threshold` seconds, or that set
+    on their route using `api.routing.slow_request_threshold`, along with
+    their last `queries_kept` queries.
+
+    Must run within `ObservabilityMiddleware`.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        threshold: float,
+        sample_interval: float = 0.1,
+        keep: int = 100,
+        queries_kept: int = 20,
+    ):
+        self.app = app
+        self.threshold = threshold
+        self.keep = keep
+        self.queries_kept = queries_kept
+        self.watchdog = SlowRequestWatchdog(threshold, sample_interval)
+        self._saving: set[asyncio.Task] = set()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        telemetry = request_telemetry.get()
+        if scope["type"] != "http" or telemetry is None:
+            await self.app(scope, receive, send)
+            return
+
+        # Only the latest queries, most requests won't be reported
+        telemetry.queries = deque(maxlen=self.queries_kept)
+        request = InFlightRequest(
+            scope=scope,
+            telemetry=telemetry,
+            task=asyncio.current_task(),
+            loop_thread_id=threading.get_ident(),
+        )
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        self.watchdog.watch(request)
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.watchdog.forget(request)
+
+        threshold = route_threshold(scope, self.threshold)
+        if time.perf_counter_ns() - telemetry.started_ns > threshold * 1e9:
+            telemetry.finish()
+            self.report(build_report(request, status_code, threshold))
+
+    def report(self, report: dict) -> None:
+        recent_reports.append(report)
+        slow_request_logger.warning(
+            "Slow request %s %s took %sms (threshold %sms) - %s",
+            report["method"],
+            report["path"],
+            report["duration_ms"],
+            report["threshold_ms"],
+            json.dumps(
+                {
+                    key: report[key]
+                    for key in ("request_id", "route", "params", "queries")
+                }
+            ),
+        )
+        # Saved in the background, outside the request's telemetry
+        task = asyncio.create_task(
+            self.save(report), context=contextvars.Context()
+        )
+        self._saving.add(task)
+        task.add_done_callback(self._saving.discard)
+
+    async def save(self, report: dict) -> None:
+        try:
+            await sync_to_async(SlowRequestReport.record)(
+                keep=self.keep, **report
+            )
+        except Exception:
+            slow_request_logger.exception("Failed to save slow request report")
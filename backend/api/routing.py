@@ -0,0 +1,262 @@
+"""Custom route classes"""
+
+import functools
+import hashlib
+import inspect
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from django.db import models
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from fastapi import Request, Response, status
+from fastapi.dependencies.models import Dependant
+from fastapi.routing import APIRoute
+from project.settings import env_setting
+from project.utils.cache import TTLCache
+from project.utils.telemetry import request_telemetry
+
+response_cache = TTLCache(
+    maxsize=env_setting.RESPONSE_CACHE_SIZE,
+    ttl=env_setting.RESPONSE_CACHE_TTL,
+)
+"""Maps request path & declared query params to its `CachedResponse`.
+Entries are tagged with labels of the models they were built from"""
+
+
+def timed_endpoint(endpoint: Callable) -> Callable:
+    """Marks when the endpoint returns so that the time spent afterwards
+    (validation & serialization of its result) can be told apart"""
+
+    if inspect.iscoroutinefunction(endpoint):
+
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                _mark_endpoint_end()
+
+    else:
+
+        @functools.wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            try:
+                return endpoint(*args, **kwargs)
+            finally:
+                _mark_endpoint_end()
+
+    return wrapper
+
+
+def _mark_endpoint_end() -> None:
+    telemetry = request_telemetry.get()
+    if telemetry is not None:
+        telemetry.endpoint_finished_ns = time.perf_counter_ns()
+
+
+class TimedAPIRoute(APIRoute):
+    """Records the `serialize` phase of the request's telemetry"""
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs):
+        super().__init__(path, timed_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        route_handler = super().get_route_handler()
+
+        async def timed_route_handler(request: Request) -> Response:
+            response = await route_handler(request)
+            telemetry = request_telemetry.get()
+            if (
+                telemetry is not None
+                and telemetry.endpoint_finished_ns is not None
+            ):
+                telemetry.add(
+                    "serialize",
+                    time.perf_counter_ns() - telemetry.endpoint_finished_ns,
+                )
+            return response
+
+        return timed_route_handler
+
+
+@dataclass(frozen=True)
+class ResponseCachePolicy:
+    tags: tuple[str, ...]
+    cache_control: str
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    media_type: str | None
+    etag: str
+
+
+def cache_tag(
+    model: type[models.Model], fields: tuple[str, ...] | None = None
+) -> str:
+    label = model._meta.label
+    return f"{label}:{','.join(fields)}" if fields else label
+
+
+def evict_cached_responses_of_relation(sender, instance, model, **kwargs):
+    response_cache.evict_tag(type(instance)._meta.label)
+    response_cache.evict_tag(model._meta.label)
+
+
+def connect_eviction(
+    model: type[models.Model], fields: tuple[str, ...] | None = None
+) -> None:
+    """Evicts responses tagged with `model` (and `fields`) once it changes.
+    Saves updating only other fields leave them"""
+    tag = cache_tag(model, fields)
+
+    def evict(sender, update_fields=None, **kwargs) -> None:
+        if fields and update_fields and not set(update_fields) & set(fields):
+            return
+        response_cache.evict_tag(tag)
+
+    for signal in (post_save, post_delete):
+        signal.connect(
+            evict,
+            sender=model,
+            weak=False,
+            dispatch_uid=f"evict_cached_responses.{tag}",
+        )
+    if fields is None:
+        for field in model._meta.many_to_many:
+            m2m_changed.connect(
+                evict_cached_responses_of_relation,
+                sender=field.remote_field.through,
+                dispatch_uid=f"evict_cached_responses.{tag}.{field.name}",
+            )
+
+
+def cache_response(
+    *models: type[models.Model],
+    fields: dict[type[models.Model], tuple[str, ...]] | None = None,
+    cache_control: str | None = None,
+):
+    """Caches successful responses of a GET route and answers them with a
+    strong `ETag`, `304` on matching `If-None-Match` & `Cache-Control`.
+
+    Entries are evicted when any of `models` changes in this process and
+    expire after `RESPONSE_CACHE_TTL` seconds for changes made elsewhere.
+    `fields` limits which changes of a model evict them to saves of the
+    fields shown. The router must use `CachedAPIRoute`.
+
+    #### Usage
+
+    ```python
+    @router.get("/faqs")
+    @cache_response(FAQ, cache_control="public, max-age=300")
+    async def get_faqs() -> list[FAQDetails]:
+    ...
+    """
+    fields = fields or {}
+    tags = []
+    for model in models:
+        model_fields = tuple(fields.get(model, ())) or None
+        connect_eviction(model, model_fields)
+        tags.append(cache_tag(model, model_fields))
+
+    def decorator(endpoint: Callable) -> Callable:
+        endpoint.response_cache_policy = ResponseCachePolicy(
+            tags=tuple(tags),
+            cache_control=cache_control or env_setting.RESPONSE_CACHE_CONTROL,
+        )
+        return endpoint
+
+    return decorator
+
+
+def slow_request_threshold(seconds: float):
+    """Overrides `SLOW_REQUEST_THRESHOLD` for the decorated route"""
+
+    def decorator(endpoint: Callable) -> Callable:
+        endpoint.slow_request_threshold = seconds
+        return endpoint
+
+    return decorator
+
+
+def declared_query_params(dependant: Dependant) -> set[str]:
+    """Names of the query params of a route & its dependencies"""
+    names, dependants = set(), [dependant]
+    while dependants:
+        dependant = dependants.pop()
+        names.update(param.alias for param in dependant.query_params)
+        dependants.extend(dependant.dependencies)
+    return names
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison, as `If-None-Match` calls for"""
+    if if_none_match.strip() == "*":
+        return True
+    return etag in (
+        tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+    )
+
+
+class CachedAPIRoute(TimedAPIRoute):
+    """Serves routes decorated with `cache_response` from the cache"""
+
+    def get_route_handler(self) -> Callable:
+        route_handler = super().get_route_handler()
+        policy: ResponseCachePolicy | None = getattr(
+            self.endpoint, "response_cache_policy", None
+        )
+        if policy is None or not env_setting.RESPONSE_CACHE_ENABLED:
+            return route_handler
+
+        # Other query params don't change the response, keying on them
+        # would only fill the cache
+        query_params = declared_query_params(self.dependant)
+
+        async def cached_route_handler(request: Request) -> Response:
+            if request.method != "GET":
+                return await route_handler(request)
+
+            key = (
+                request.url.path,
+                tuple(
+                    sorted(
+                        item
+                        for item in request.query_params.multi_items()
+                        if item[0] in query_params
+                    )
+                ),
+            )
+            cached: CachedResponse | None = response_cache.get(key)
+            if cached is None:
+                response = await route_handler(request)
+                if response.status_code != status.HTTP_200_OK or not hasattr(
+                    response, "body"
+                ):
+                    return response
+
+                digest = hashlib.blake2b(response.body, digest_size=16)
+                cached = CachedResponse(
+                    body=response.body,
+                    media_type=response.media_type,
+                    etag=f'"{digest.hexdigest()}"',
+                )
+                response_cache.set(key, cached, tags=policy.tags)
+
+            headers = {
+                "ETag": cached.etag,
+                "Cache-Control": policy.cache_control,
+            }
+            if_none_match = request.headers.get("if-none-match")
+            if if_none_match and etag_matches(if_none_match, cached.etag):
+                return Response(
+                    status_code=status.HTTP_304_NOT_MODIFIED, headers=headers
+                )
+            return Response(
+                cached.body, media_type=cached.media_type, headers=headers
+            )
+
+        return cached_route_handler
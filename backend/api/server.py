@@ -0,0 +1,166 @@
+"""Pre-forking server running the api in several uvicorn workers.
+
+The master imports & warms up the app once, then freezes what it holds
+out of the garbage collector so that forked workers keep sharing those
+pages copy-on-write. Workers accept connections on one shared socket and
+are replaced once they have served their share of requests.
+"""
+
+import gc
+import logging
+import os
+import random
+import signal
+import socket
+import time
+
+import uvicorn
+from django.db import connections
+from fastapi import FastAPI
+from project.settings import env_setting
+from project.utils.metrics import registry
+
+from api.health import warm_templates
+
+logger = logging.getLogger("uvicorn.error")
+
+RESPAWN_DELAY = 1
+"""Seconds to wait before replacing a worker that failed on startup"""
+
+
+def warm_up(app: FastAPI) -> None:
+    """Does what would otherwise be done by each worker on first use"""
+    app.openapi()
+    warm_templates()
+
+
+def bind_socket(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+class PreforkServer:
+    def __init__(
+        self,
+        app: FastAPI,
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        workers: int = 2,
+        max_requests: int = 0,
+        max_requests_jitter: int = 0,
+        timeout_graceful_shutdown: int | None = 30,
+    ):
+        self.app = app
+        self.workers = workers
+        self.max_requests = max_requests
+        self.max_requests_jitter = max_requests_jitter
+        self.config = uvicorn.Config(
+            app,
+            host=host,
+            port=port,
+            lifespan="on",
+            timeout_graceful_shutdown=timeout_graceful_shutdown,
+        )
+        self.socket: socket.socket | None = None
+        self.pids: dict[int, float] = {}
+        """Maps workers' pids to when they were started"""
+        self.stopping = False
+
+    @property
+    def metrics_dir(self) -> str | None:
+        if env_setting.METRICS_ENABLED:
+            return env_setting.METRICS_DIR
+
+    def run(self) -> None:
+        if self.metrics_dir:
+            os.makedirs(self.metrics_dir, exist_ok=True)
+            registry.clear_directory(self.metrics_dir)
+        warm_up(self.app)
+        # Connections must not be shared by workers
+        connections.close_all()
+        gc.collect()
+        gc.freeze()
+
+        self.socket = bind_socket(self.config.host, self.config.port)
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        logger.info(
+            "Serving on http://%s:%d with %d workers (master pid %d)",
+            self.config.host,
+            self.config.port,
+            self.workers,
+            os.getpid(),
+        )
+
+        try:
+            while len(self.pids) < self.workers:
+                self.spawn()
+            self.supervise()
+        finally:
+            self.socket.close()
+
+    def supervise(self) -> None:
+        while self.pids:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            started = self.pids.pop(pid, None)
+            if started is None:
+                continue
+            if self.metrics_dir:
+                # Before its pid gets reused
+                registry.retire(self.metrics_dir, pid)
+            if self.stopping:
+                continue
+
+            exit_code = os.waitstatus_to_exitcode(status)
+            if exit_code == 0:
+                logger.info("Worker %d recycled", pid)
+            else:
+                logger.warning("Worker %d exited with %d", pid, exit_code)
+                if time.monotonic() - started < RESPAWN_DELAY:
+                    time.sleep(RESPAWN_DELAY)
+            if not self.stopping:
+                self.spawn()
+
+    def spawn(self) -> None:
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 1
+            try:
+                self.serve()
+                exit_code = 0
+            except BaseException:
+                logger.exception("Worker %d failed", os.getpid())
+            finally:
+                os._exit(exit_code)
+
+        self.pids[pid] = time.monotonic()
+
+    def serve(self) -> None:
+        """Runs in the worker"""
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, signal.SIG_DFL)
+        # Otherwise workers would generate the same "random" values
+        random.seed()
+
+        if self.max_requests:
+            self.config.limit_max_requests = self.max_requests + (
+                random.randint(0, self.max_requests_jitter)
+            )
+        uvicorn.Server(self.config).run(sockets=[self.socket])
+
+    def stop(self, signum: int, frame) -> None:
+        """Lets workers finish their requests, then exits"""
+        self.stopping = True
+        for pid in self.pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
@@ -0,0 +1,85 @@
+import gzip
+from unittest import TestCase
+
+from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from api.middleware.compression import CompressionMiddleware, choose_encoding
+
+
+class TestCompression(TestCase):
+    def setUp(self):
+        app = FastAPI()
+
+        @app.get("/large")
+        async def large() -> list[dict]:
+            return [{"id": index, "title": "message"} for index in range(100)]
+
+        @app.get("/small")
+        async def small() -> dict:
+            return {}
+
+        @app.get("/image")
+        async def image() -> Response:
+            return Response(b"\x89PNG" * 500, media_type="image/png")
+
+        @app.get("/partial")
+        async def partial() -> Response:
+            return Response(
+                b"a" * 1000,
+                status_code=206,
+                headers={"Content-Range": "bytes 0-999/2000"},
+                media_type="text/plain",
+            )
+
+        @app.get("/stream")
+        async def stream() -> StreamingResponse:
+            async def lines():
+                for index in range(50):
+                    yield f"line {index}\n"
+
+            return StreamingResponse(lines(), media_type="text/plain")
+
+        app.add_middleware(CompressionMiddleware, minimum_size=500)
+        self.client = TestClient(app, headers={"Accept-Encoding": "gzip"})
+
+    def test_choose_encoding(self):
+        self.assertEqual(choose_encoding("gzip, deflate"), "gzip")
+        self.assertEqual(choose_encoding("*"), choose_encoding("zstd, br, *"))
+        self.assertIsNone(choose_encoding("identity"))
+        self.assertIsNone(choose_encoding("gzip;q=0"))
+
+    def test_compresses_large_json(self):
+        resp = self.client.get("/large")
+        self.assertEqual(resp.headers["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", resp.headers["Vary"])
+        self.assertEqual(len(resp.json()), 100)
+        self.assertLess(int(resp.headers["Content-Length"]), len(resp.content))
+
+    def test_skips_small_and_media(self):
+        for path in ("/small", "/image"):
+            resp = self.client.get(path)
+            self.assertNotIn("Content-Encoding", resp.headers)
+
+    def test_varies_without_accepted_encoding(self):
+        resp = self.client.get(
+            "/large", headers={"Accept-Encoding": "identity"}
+        )
+        self.assertNotIn("Content-Encoding", resp.headers)
+        self.assertIn("Accept-Encoding", resp.headers["Vary"])
+
+    def test_skips_partial_content(self):
+        resp = self.client.get("/partial")
+        self.assertNotIn("Content-Encoding", resp.headers)
+        self.assertEqual(len(resp.content), 1000)
+
+    def test_streams(self):
+        with self.client.stream("GET", "/stream") as resp:
+            self.assertEqual(resp.headers["Content-Encoding"], "gzip")
+            self.assertNotIn("Content-Length", resp.headers)
+            body = b"".join(resp.iter_raw())
+        self.assertEqual(
+            gzip.decompress(body).decode(),
+            "".join(f"line {index}\n" for index in range(50)),
+        )
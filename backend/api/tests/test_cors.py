@@ -0,0 +1,82 @@
+from unittest import TestCase
+
+from django.conf import settings
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from project.settings import base
+
+from api.middleware.cors import CachedCORSMiddleware, merge_regexes
+
+
+class TestCORS(TestCase):
+    def setUp(self):
+        app = FastAPI()
+
+        @app.get("/items")
+        async def items() -> list:
+            return []
+
+        app.add_middleware(
+            CachedCORSMiddleware,
+            allow_origins=["https://example.com"],
+            allow_origin_regexes=[
+                r"https://.*\.example\.com",
+                r"http://localhost:\d+",
+            ],
+            allow_methods=["GET"],
+            max_age=1800,
+        )
+        self.middleware = CachedCORSMiddleware(
+            app,
+            allow_origins=["https://example.com"],
+            allow_origin_regexes=[r"https://.*\.example\.com"],
+        )
+        self.client = TestClient(app)
+
+    def test_mounted_django_middleware(self):
+        cors_middleware = "corsheaders.middleware.CorsMiddleware"
+        # Handled by the API's middleware
+        self.assertNotIn(cors_middleware, settings.MIDDLEWARE)
+        self.assertIn(cors_middleware, base.MIDDLEWARE)
+
+    def test_merge_regexes(self):
+        self.assertIsNone(merge_regexes([]))
+        self.assertEqual(merge_regexes(["a|b", "c"]), "(?:a|b)|(?:c)")
+
+    def test_allowed_origins(self):
+        for origin, allowed in (
+            ("https://example.com", True),
+            ("https://app.example.com", True),
+            ("http://localhost:8000", True),
+            ("http://localhost:8000.evil.com", False),
+            ("https://example.org", False),
+        ):
+            resp = self.client.get("/items", headers={"Origin": origin})
+            self.assertEqual(
+                resp.headers.get("access-control-allow-origin") == origin,
+                allowed,
+                origin,
+            )
+
+    def test_origin_decisions_cached(self):
+        is_allowed_origin = self.middleware.is_allowed_origin
+        self.assertTrue(is_allowed_origin("https://app.example.com"))
+        self.assertTrue(is_allowed_origin("https://app.example.com"))
+        self.assertFalse(is_allowed_origin("https://example.org"))
+        info = is_allowed_origin.cache_info()
+        self.assertEqual((info.hits, info.misses), (1, 2))
+
+    def test_preflight(self):
+        resp = self.client.options(
+            "/items",
+            headers={
+                "Origin": "https://app.example.com",
+                "Access-Control-Request-Method": "GET",
+            },
+        )
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.headers["access-control-max-age"], "1800")
+        self.assertEqual(
+            resp.headers["access-control-allow-origin"],
+            "https://app.example.com",
+        )
@@ -0,0 +1,67 @@
+import asyncio
+from unittest import TestCase
+from unittest.mock import patch
+
+from django.template import engines
+from fastapi.testclient import TestClient
+
+from api import app
+from api.health import (
+    database_ping,
+    warm_templates,
+    warm_up,
+    warmup_state,
+)
+from api.routing import response_cache
+
+client = TestClient(app)
+
+
+class TestHealth(TestCase):
+    def test_liveness(self):
+        resp = client.get(app.url_path_for("Check API liveness"))
+        self.assertEqual(resp.status_code, 200)
+
+    def test_readiness(self):
+        url = app.url_path_for("Check API readiness")
+        with patch.object(warmup_state, "ready", False):
+            self.assertEqual(client.get(url).status_code, 503)
+
+        response_cache.clear()
+        asyncio.run(warm_up(app))
+        self.assertTrue(warmup_state.ready)
+        self.assertEqual(warmup_state.failed_steps, [])
+        self.assertGreater(len(response_cache), 0)
+        self.assertEqual(client.get(url).status_code, 200)
+
+        resp = client.get(url, params={"deep": True})
+        self.assertEqual(resp.status_code, 200)
+        data = resp.json()
+        self.assertIsNotNone(data["database"]["latency_ms"])
+        self.assertEqual(
+            data["caches"]["responses"]["size"], len(response_cache)
+        )
+        self.assertTrue(data["database"]["reachable"])
+
+    def test_failed_database_ping_hides_error(self):
+        url = app.url_path_for("Check API readiness")
+        database_ping.checked_at = float("-inf")
+        self.addCleanup(setattr, database_ping, "checked_at", float("-inf"))
+        with (
+            patch("api.health.connection") as connection,
+            self.assertLogs("api.health", "ERROR"),
+        ):
+            connection.cursor.side_effect = Exception(
+                "password authentication failed"
+            )
+            resp = client.get(url, params={"deep": True})
+        self.assertEqual(resp.status_code, 503)
+        self.assertFalse(resp.json()["database"]["reachable"])
+        self.assertNotIn("password", resp.text)
+
+    def test_warm_templates(self):
+        self.assertGreaterEqual(warm_templates(), 2)
+        loader = engines["django"].engine.template_loaders[0]
+        self.assertTrue(
+            any("api/v1/email" in str(key) for key in loader.get_template_cache)
+        )
@@ -0,0 +1,90 @@
+import asyncio
+from unittest import TestCase
+from unittest.mock import patch
+
+import httpx
+from project.settings import env_setting
+from project.utils.http_clients import HTTPClients
+from project.utils.metrics import http_client_request_duration
+
+
+def respond(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json={"path": request.url.path})
+
+
+class TestHTTPClients(TestCase):
+    def setUp(self):
+        self.clients = HTTPClients()
+        self.clients.register(
+            "mock",
+            base_url="http://mock.test",
+            transport=httpx.MockTransport(respond),
+        )
+        self.clients.register("pooled", base_url="http://pooled.test")
+        self.clients.register(
+            "limited",
+            base_url="http://limited.test",
+            limits=httpx.Limits(max_connections=2),
+        )
+
+    def test_client_shared_within_loop(self):
+        async def get_clients():
+            first = self.clients.get("mock")
+            resp = await first.get("/ping")
+            self.assertEqual(resp.json(), {"path": "/ping"})
+            self.assertIs(self.clients.get("mock"), first)
+            return first
+
+        first = asyncio.run(get_clients())
+        # Closed along with its loop, whose connections can't be reused
+        self.assertTrue(first.is_closed)
+        second = asyncio.run(get_clients())
+        self.assertIsNot(second, first)
+
+        asyncio.run(self.clients.aclose())
+        self.assertTrue(second.is_closed)
+
+    def test_sync_client(self):
+        client = self.clients.get_sync("mock")
+        self.assertIs(self.clients.get_sync("mock"), client)
+        self.assertEqual(client.timeout.connect, 5)
+
+        resp = client.get("/upload")
+        self.assertTrue(resp.is_success)
+        self.assertIn(
+            ["GET", "mock.test", "200"],
+            [labels for labels, _ in http_client_request_duration.samples()],
+        )
+        client.close()
+
+    def test_stats(self):
+        self.clients.get_sync("pooled")
+        self.clients.get_sync("limited")
+        self.assertEqual(
+            self.clients.stats(),
+            {
+                "pooled-sync": {
+                    "active": 0,
+                    "idle": 0,
+                    "limit": env_setting.HTTP_CLIENT_MAX_CONNECTIONS,
+                },
+                "limited-sync": {"active": 0, "idle": 0, "limit": 2},
+            },
+        )
+
+    def test_stats_without_reachable_pool(self):
+        client = self.clients.get_sync("pooled")
+        del client._transport._pool
+        self.assertEqual(self.clients.stats(), {})
+
+    def test_http2_checked_once(self):
+        with (
+            patch.object(env_setting, "HTTP_CLIENT_HTTP2", True),
+            patch("project.utils.http_clients.h2", None),
+            self.assertLogs("project.utils.http_clients", "WARNING") as logs,
+        ):
+            self.clients.get_sync("pooled")
+            self.clients.get_sync("limited")
+            self.clients.stats()
+        self.assertEqual(len(logs.records), 1)
+        self.assertFalse(self.clients.http2)
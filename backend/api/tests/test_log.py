@@ -0,0 +1,61 @@
+import logging
+import logging.handlers
+import os
+import queue
+from unittest import TestCase, skipUnless
+
+from project.utils.log import QueueHandler
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+class TestQueueHandler(TestCase):
+    def test_starts_listener_on_first_record(self):
+        target = ListHandler()
+        handler = QueueHandler(queue.Queue())
+        handler.listener = logging.handlers.QueueListener(handler.queue, target)
+        logger = logging.getLogger("api.tests.queue")
+        logger.addHandler(handler)
+        try:
+            logger.warning("Written without the API lifespan")
+            handler.stop_listener()
+        finally:
+            logger.removeHandler(handler)
+
+        self.assertEqual(
+            [record.getMessage() for record in target.records],
+            ["Written without the API lifespan"],
+        )
+        self.assertIsNone(handler.listener_pid)
+
+    @skipUnless(hasattr(os, "fork"), "Needs fork")
+    def test_restarts_listener_after_fork(self):
+        target = ListHandler()
+        handler = QueueHandler(queue.Queue())
+        handler.listener = logging.handlers.QueueListener(handler.queue, target)
+        handler.start_listener()
+        self.addCleanup(handler.stop_listener)
+        parent_listener = handler.listener
+
+        pid = os.fork()
+        if pid == 0:
+            handler.handle(logging.makeLogRecord({"msg": "From the child"}))
+            handler.stop_listener()
+            written = [record.getMessage() for record in target.records]
+            os._exit(
+                0
+                if written == ["From the child"]
+                and handler.listener is not parent_listener
+                else 1
+            )
+
+        _, status = os.waitpid(pid, 0)
+        self.assertEqual(os.waitstatus_to_exitcode(status), 0)
+        self.assertEqual(target.records, [])
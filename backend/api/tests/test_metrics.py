@@ -0,0 +1,116 @@
+import glob
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from project.settings import env_setting
+from project.utils.metrics import (
+    MetricsRegistry,
+    merge_snapshots,
+    render_prometheus,
+)
+
+from api.metrics import collect_component_stats, router as metrics_router
+from api.middleware import register_middlewares
+
+
+class TestMetrics(TestCase):
+    def setUp(self):
+        self.registry = MetricsRegistry()
+        self.requests = self.registry.counter(
+            "requests_total", "Requests", ("route",)
+        )
+        self.in_progress = self.registry.gauge("in_progress", "In progress")
+        self.duration = self.registry.histogram(
+            "duration_seconds", "Duration", buckets=(0.1, 1)
+        )
+
+    def test_render(self):
+        self.requests.inc("/a")
+        self.requests.inc("/a")
+        self.duration.observe(value=0.05)
+        self.duration.observe(value=5)
+        text = render_prometheus(self.registry.snapshot())
+        self.assertIn('requests_total{route="/a"} 2', text)
+        self.assertIn('duration_seconds_bucket{le="0.1"} 1', text)
+        self.assertIn('duration_seconds_bucket{le="+Inf"} 2', text)
+        self.assertIn("duration_seconds_count 2", text)
+
+    def test_merge_across_processes(self):
+        self.requests.inc("/a")
+        self.in_progress.inc()
+        self.duration.observe(value=0.5)
+        snapshot = self.registry.snapshot()
+        merged = merge_snapshots([(snapshot, True), (snapshot, False)])
+        text = render_prometheus(merged)
+        self.assertIn('requests_total{route="/a"} 2', text)
+        self.assertIn("duration_seconds_count 2", text)
+        # Gauges of exited processes are dropped
+        self.assertIn("in_progress 1", text)
+
+    def test_collect_from_directory(self):
+        self.requests.inc("/a")
+        with tempfile.TemporaryDirectory() as directory:
+            self.registry.write_snapshot(directory)
+            text = render_prometheus(self.registry.collect(directory))
+        self.assertIn('requests_total{route="/a"} 1', text)
+
+    def test_retire_exited_processes(self):
+        self.requests.inc("/a")
+        self.in_progress.inc()
+        process = subprocess.Popen([sys.executable, "-c", ""])
+        process.wait()
+        with tempfile.TemporaryDirectory() as directory:
+            # Left by a worker that exited
+            with open(
+                os.path.join(directory, f"metrics-{process.pid}-0.json"), "w"
+            ) as file:
+                json.dump({"metrics": self.registry.snapshot()}, file)
+
+            for _ in range(2):
+                text = render_prometheus(self.registry.collect(directory))
+                self.assertIn('requests_total{route="/a"} 2', text)
+                self.assertIn("in_progress 1", text)
+
+            self.assertEqual(
+                sorted(map(os.path.basename, glob.glob(f"{directory}/*"))),
+                [self.registry.snapshot_file, "retired.json"],
+            )
+            self.registry.clear_directory(directory)
+            self.assertEqual(glob.glob(f"{directory}/*"), [])
+
+    def test_endpoint(self):
+        metrics_app = FastAPI()
+
+        @metrics_app.get("/health")
+        async def health() -> dict:
+            return {}
+
+        metrics_app.include_router(metrics_router)
+        client = TestClient(register_middlewares(metrics_app))
+        self.assertTrue(client.get("/health").is_success)
+        collect_component_stats()
+        resp = client.get(env_setting.METRICS_PATH)
+        self.assertTrue(resp.is_success)
+        self.assertIn(
+            'http_requests_total{method="GET",route="/health",status="200"}',
+            resp.text,
+        )
+        self.assertIn("http_request_duration_seconds_bucket", resp.text)
+        self.assertIn("# TYPE cache_lookups_total counter", resp.text)
+        self.assertIn("password_hasher_rejected_total", resp.text)
+
+        with patch.object(env_setting, "METRICS_TOKEN", "secret"):
+            resp = client.get(env_setting.METRICS_PATH)
+            self.assertEqual(resp.status_code, 401)
+            resp = client.get(
+                env_setting.METRICS_PATH,
+                headers={"Authorization": "Bearer secret"},
+            )
+            self.assertTrue(resp.is_success)
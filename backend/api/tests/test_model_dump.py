@@ -0,0 +1,83 @@
+from decimal import Decimal
+from unittest import TestCase
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from external.models import FAQ
+from finance.models import Transaction
+from project.utils.models import (
+    get_dump_plan,
+    get_fetch_plan,
+    model_dump_many,
+)
+from users.models import CustomUser
+
+
+class TestModelDump(TestCase):
+    def setUp(self):
+        self.created_at = timezone.now()
+        self.transaction = Transaction(
+            id=1,
+            user_id=1,
+            type="Deposit",
+            amount=Decimal("10.50"),
+            reference="REF",
+            created_at=self.created_at,
+        )
+
+    def test_plan_cached(self):
+        self.assertIs(
+            get_dump_plan(FAQ, (), ("answer",), False),
+            get_dump_plan(FAQ, (), ("answer",), False),
+        )
+        self.assertIsNot(
+            get_dump_plan(FAQ, (), (), False),
+            get_dump_plan(FAQ, (), ("answer",), False),
+        )
+
+    def test_converters(self):
+        dumped = self.transaction.model_dump(exclude=["notes"])
+        self.assertNotIn("notes", dumped)
+        # Relations are left out unless all=True
+        self.assertNotIn("user", dumped)
+        self.assertEqual(dumped["amount"], "10.50")
+        self.assertEqual(dumped["created_at"], self.created_at.isoformat())
+
+        faq = FAQ(id=1, question="Why?", answer="Because")
+        self.assertEqual(faq.model_dump()["question"], "Why?")
+
+    def test_unexpanded_relation(self):
+        with CaptureQueriesContext(connection) as queries:
+            dumped = self.transaction.model_dump(
+                all=True, exclude=["user__groups"]
+            )
+        self.assertEqual(dumped["user"], 1)
+        self.assertEqual(len(queries), 0)
+
+    def test_fetch_plan(self):
+        self.assertEqual(
+            get_fetch_plan(Transaction, ("user",), (), False), (("user",), ())
+        )
+        self.assertEqual(
+            get_fetch_plan(CustomUser, ("transactions",), (), False),
+            ((), ("transactions",)),
+        )
+        # Relations of prefetched objects are prefetched along
+        self.assertEqual(
+            get_fetch_plan(CustomUser, ("account__user",), (), False),
+            (("account", "account__user"), ()),
+        )
+
+    def test_dump_many(self):
+        transactions = Transaction.objects.order_by("id")[:5]
+        with CaptureQueriesContext(connection) as queries:
+            dumped = model_dump_many(transactions, relations=["user"])
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(
+            dumped,
+            [
+                transaction.model_dump(relations=["user"])
+                for transaction in transactions
+            ],
+        )
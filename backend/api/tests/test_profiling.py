@@ -0,0 +1,57 @@
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from project.settings import env_setting
+from project.utils.profiling import issue_profiling_token
+
+from api.middleware import register_middlewares
+
+
+class TestProfiling(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        patcher = patch.multiple(
+            env_setting,
+            PROFILING_ENABLED=True,
+            PROFILING_DIR=self.directory.name,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.directory.cleanup)
+
+        app = FastAPI()
+
+        @app.get("/work")
+        async def work() -> dict:
+            return {"total": sum(range(10_000))}
+
+        self.client = TestClient(register_middlewares(app))
+        self.token = issue_profiling_token("developer")
+
+    def test_profilers(self):
+        for kind, extension in (("sample", "folded"), ("cprofile", "prof")):
+            resp = self.client.get(
+                "/work",
+                headers={"X-Profile": kind, "X-Profile-Token": self.token},
+            )
+            self.assertTrue(resp.is_success)
+            profile_id = resp.headers["X-Profile-Id"]
+            self.assertTrue(
+                os.path.isfile(
+                    os.path.join(
+                        self.directory.name, f"{profile_id}.{extension}"
+                    )
+                )
+            )
+
+    def test_invalid_token(self):
+        resp = self.client.get(
+            "/work",
+            headers={"X-Profile": "cprofile", "X-Profile-Token": "invalid"},
+        )
+        self.assertTrue(resp.is_success)
+        self.assertNotIn("X-Profile-Id", resp.headers)
@@ -0,0 +1,91 @@
+import asyncio
+from unittest import TestCase
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from api.dependencies.security.rate_limit import (
+    CacheRateLimitBackend,
+    MemoryRateLimitBackend,
+    RateLimiter,
+    parse_rate,
+)
+
+
+class TestRateLimiter(TestCase):
+    def setUp(self):
+        app = FastAPI()
+        limiter = RateLimiter(
+            "test",
+            "2/minute",
+            "username",
+            ip_rate="4/minute",
+            backend=MemoryRateLimitBackend(),
+        )
+
+        @app.get("/limited", dependencies=[Depends(limiter)])
+        async def limited() -> dict:
+            return {}
+
+        self.client = TestClient(app)
+
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate("10/minute"), (10, 60))
+        self.assertEqual(parse_rate("100/5minutes"), (100, 300))
+        with self.assertRaises(ValueError):
+            parse_rate("10 per minute")
+
+    def test_limits_per_identity(self):
+        for _ in range(2):
+            resp = self.client.get("/limited", params=dict(username="a"))
+            self.assertTrue(resp.is_success)
+
+        resp = self.client.get("/limited", params=dict(username="A"))
+        self.assertEqual(resp.status_code, 429)
+        self.assertGreaterEqual(int(resp.headers["Retry-After"]), 1)
+
+        resp = self.client.get("/limited", params=dict(username="b"))
+        self.assertTrue(resp.is_success)
+
+    def test_limits_per_ip(self):
+        for username in "abcd":
+            resp = self.client.get("/limited", params=dict(username=username))
+            self.assertTrue(resp.is_success)
+
+        resp = self.client.get("/limited", params=dict(username="e"))
+        self.assertEqual(resp.status_code, 429)
+
+
+class TestMemoryRateLimitBackend(TestCase):
+    def test_evicts_least_recently_hit_per_scope(self):
+        backend = MemoryRateLimitBackend(max_keys=2)
+
+        async def hit(scope: str, key: str) -> float | None:
+            return await backend.hit(scope, key, 1, 3600)
+
+        self.assertIsNone(asyncio.run(hit("reset", "a")))
+        for key in "abcd":
+            asyncio.run(hit("token", key))
+
+        self.assertEqual(list(backend._scopes["token"]), ["c", "d"])
+        # Other scopes keep their windows
+        self.assertIsNotNone(asyncio.run(hit("reset", "a")))
+
+
+class TestCacheRateLimitBackend(TestCase):
+    def test_clear_keeps_other_entries(self):
+        backend = CacheRateLimitBackend()
+        backend.cache.set("api.tests.unrelated", 1)
+
+        async def hit() -> float | None:
+            return await backend.hit("token", "a", 2, 3600)
+
+        self.assertIsNone(asyncio.run(hit()))
+        self.assertIsNone(asyncio.run(hit()))
+        self.assertIsNotNone(asyncio.run(hit()))
+        # Rejected hits aren't counted
+        self.assertIsNotNone(asyncio.run(hit()))
+
+        backend.clear()
+        self.assertIsNone(asyncio.run(hit()))
+        self.assertEqual(backend.cache.get("api.tests.unrelated"), 1)
@@ -0,0 +1,19 @@
+from unittest import TestCase
+
+from api import app
+from api.server import bind_socket, warm_up
+
+
+class TestServer(TestCase):
+    def test_warm_up(self):
+        app.openapi_schema = None
+        warm_up(app)
+        self.assertIsNotNone(app.openapi_schema)
+
+    def test_bind_socket(self):
+        sock = bind_socket("127.0.0.1", 0)
+        try:
+            self.assertTrue(sock.get_inheritable())
+            self.assertNotEqual(sock.getsockname()[1], 0)
+        finally:
+            sock.close()
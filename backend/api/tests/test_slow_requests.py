@@ -0,0 +1,60 @@
+import time
+from unittest import TestCase
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from management.models import SlowRequestReport
+from users.models import CustomUser
+
+from api.middleware.observability import ObservabilityMiddleware
+from api.middleware.slow_requests import SlowRequestMiddleware, recent_reports
+from api.routing import slow_request_threshold
+
+
+def block_event_loop():
+    time.sleep(0.3)
+
+
+class TestSlowRequests(TestCase):
+    def setUp(self):
+        app = FastAPI()
+
+        @app.get("/slow")
+        @slow_request_threshold(0.05)
+        async def slow() -> dict:
+            await CustomUser.objects.acount()
+            block_event_loop()
+            return {}
+
+        @app.get("/fast")
+        async def fast() -> dict:
+            return {}
+
+        app.add_middleware(
+            SlowRequestMiddleware, threshold=10, sample_interval=0.01
+        )
+        app.add_middleware(ObservabilityMiddleware)
+        self.app = app
+        recent_reports.clear()
+
+    def test_reports_slow_requests(self):
+        with TestClient(self.app) as client:
+            self.assertTrue(client.get("/fast").is_success)
+            self.assertEqual(len(recent_reports), 0)
+
+            resp = client.get("/slow", params=dict(page=2))
+            self.assertTrue(resp.is_success)
+            self.assertEqual(len(recent_reports), 1)
+            report = recent_reports[-1]
+            self.assertEqual(report["threshold_ms"], 50)
+            self.assertEqual(report["params"]["query"], "page=2")
+            self.assertEqual(len(report["queries"]), 1)
+            self.assertIn("block_event_loop", report["stack_samples"])
+
+            for _ in range(50):
+                saved = SlowRequestReport.objects.filter(path="/slow")
+                if saved.exists():
+                    break
+                time.sleep(0.05)
+        self.assertTrue(saved.exists())
+        saved.delete()
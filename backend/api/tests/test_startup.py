@@ -0,0 +1,45 @@
+from unittest import TestCase
+
+from project.utils.startup import StartupReport, parse_importtime
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+phase: django.setup
+import time:       120 |        120 |     django.utils.version
+import time:       300 |        420 |   django.utils
+import time:       500 |        920 | django
+phase: import api
+import time:       800 |        800 | fastapi
+"""
+
+
+class TestStartupReport(TestCase):
+    def setUp(self):
+        self.report = StartupReport(
+            phases={"django.setup": 0.5, "import api": 0.25},
+            imports=parse_importtime(IMPORTTIME_OUTPUT),
+        )
+
+    def test_parse_importtime(self):
+        self.assertEqual(len(self.report.imports), 4)
+        self.assertEqual(self.report.imports[1].module, "django.utils")
+        self.assertEqual(self.report.imports[1].cumulative_us, 420)
+
+    def test_phases(self):
+        self.assertEqual(
+            [record.phase for record in self.report.imports],
+            ["django.setup"] * 3 + ["import api"],
+        )
+
+    def test_packages(self):
+        self.assertEqual(
+            self.report.packages().most_common(),
+            [("django", 920), ("fastapi", 800)],
+        )
+
+    def test_format(self):
+        lines = self.report.format(top=1).splitlines()
+        self.assertIn("750.0 ms", lines[3])
+        self.assertIn("django", lines[6])
+        self.assertNotIn("fastapi", "\n".join(lines[6:8]))
+        self.assertTrue(lines[-1].strip().startswith("django "))
@@ -1,5 +1,8 @@
 """Common functions for tests"""
 
+from contextlib import contextmanager
+
+from project.utils.telemetry import observe_requests
 from pydantic import BaseModel
 
 
@@ -10,3 +13,27 @@ def get_model_example(model: BaseModel) -> dict:
         else model.Config.json_schema_extra
     )
     return container.get("example") or container["examples"][0]
+
+
+class QueryBudgetMixin:
+    """Lets `TestCase`s assert how many queries requests may run"""
+
+    @contextmanager
+    def assertMaxQueries(self, budget: int, repeat_threshold: int = 0):
+        """Fails when a request made within the block runs more than `budget`
+        queries or, if set, any query at least `repeat_threshold` times"""
+        with observe_requests() as finished:
+            yield finished
+
+        self.assertTrue(finished, "No request was made")
+        for telemetry in finished:
+            self.assertLessEqual(
+                telemetry.query_count,
+                budget,
+                f"Request ran {telemetry.query_count} queries: "
+                f"{dict(telemetry.query_shapes)}",
+            )
+            if repeat_threshold:
+                self.assertEqual(
+                    telemetry.repeated_queries(repeat_threshold), {}
+                )
@@ -1,13 +1,32 @@
+import asyncio
+from datetime import timedelta
+from functools import partial
 from unittest import TestCase
+from unittest.mock import patch
 
+from django.contrib.auth import aget_user
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.sessions.backends.db import SessionStore
+from django.test import AsyncRequestFactory
+from django.utils import timezone
+from fastapi import HTTPException
 from fastapi.testclient import TestClient
 from finance._enums import TransactionMeans, TransactionType
 from finance.models import Account, Transaction
+from project.settings import env_setting
+from users.cache import (
+    UsernameIndex,
+    publish_user_generation,
+    user_token_cache,
+)
 from users.models import AuthToken, CustomUser
+from users.views import Login, Logout
 
 from api import app, v1_router
+from api.dependencies.security.rate_limit import rate_limit_backend
 from api.tests import base_url, client, test_credentials
-from api.tests.utils import get_model_example
+from api.tests.utils import QueryBudgetMixin, get_model_example
+from api.v1.account.hashing import PasswordHasherPool
 from api.v1.account.models import (
     EditablePersonalData,
     PaymentAccountDetails,
@@ -15,11 +34,14 @@ from api.v1.account.models import (
     SendMPESAPopupTo,
     TokenAuth,
 )
+from api.v1.account.utils import generate_token, signed_token_id
 from api.v1.models import ProcessFeedback
 
 
-class TestCaseWithAuth(TestCase):
+class TestCaseWithAuth(QueryBudgetMixin, TestCase):
     def setUp(self):
+        rate_limit_backend.clear()
+
         def get_token():
             resp = client.post(
                 v1_router.url_path_for("User auth token"),
@@ -45,6 +67,74 @@ class TestAccounts(TestCaseWithAuth):
         resp = self.auth_client.get(v1_router.url_path_for("Get user profile"))
         self.assertTrue(resp.is_success)
 
+    def test_token_cache_eviction(self):
+        resp = self.auth_client.get(v1_router.url_path_for("Get user profile"))
+        self.assertTrue(resp.is_success)
+        self.assertIsNotNone(user_token_cache.get(("user", self.auth_token)))
+
+        resp = self.auth_client.patch(
+            v1_router.url_path_for("Generate new user token")
+        )
+        self.assertTrue(resp.is_success)
+        self.assertIsNone(user_token_cache.get(("user", self.auth_token)))
+
+        resp = self.auth_client.get(v1_router.url_path_for("Get user profile"))
+        self.assertEqual(resp.status_code, 401)
+
+    def test_token_cache_shared_eviction(self):
+        profile_url = v1_router.url_path_for("Get user profile")
+        with patch.object(env_setting, "AUTH_TOKEN_CACHE_ALIAS", "default"):
+            self.assertTrue(self.auth_client.get(profile_url).is_success)
+            # Revoked through another worker, whose signals don't reach here
+            CustomUser.objects.filter(pk=self.user.pk).update(
+                token_version=self.user.token_version + 1
+            )
+            publish_user_generation(self.user.pk)
+            try:
+                resp = self.auth_client.get(profile_url)
+                self.assertEqual(resp.status_code, 401)
+            finally:
+                CustomUser.objects.filter(pk=self.user.pk).update(
+                    token_version=self.user.token_version
+                )
+
+    def test_signed_and_opaque_tokens(self):
+        profile_url = v1_router.url_path_for("Get user profile")
+        self.assertTrue(self.auth_token.startswith(signed_token_id))
+
+        tampered_token = self.auth_token[:-1] + (
+            "A" if self.auth_token[-1] != "A" else "B"
+        )
+        resp = client.get(
+            profile_url, headers={"Authorization": f"Bearer {tampered_token}"}
+        )
+        self.assertEqual(resp.status_code, 401)
+
+        # Legacy opaque tokens remain valid
+        self.user.token = generate_token()
+        self.user.save()
+        resp = client.get(
+            profile_url, headers={"Authorization": f"Bearer {self.user.token}"}
+        )
+        self.assertTrue(resp.is_success)
+
+    def test_django_session_login(self):
+        async def login_and_logout(token: str):
+            request = AsyncRequestFactory().post(
+                "/d/user/login", {"token": token}
+            )
+            request.session = SessionStore()
+            request.user = AnonymousUser()
+            request.auser = partial(aget_user, request)
+            login_resp = await Login.as_view()(request)
+            self.assertEqual(await request.auser(), self.user)
+            logout_resp = await Logout.as_view()(request)
+            return login_resp, logout_resp
+
+        login_resp, logout_resp = asyncio.run(login_and_logout(self.auth_token))
+        self.assertEqual(login_resp.status_code, 200)
+        self.assertEqual(logout_resp.status_code, 200)
+
     def test_update_profile(self):
         resp = self.auth_client.patch(
             v1_router.url_path_for("Update user profile"),
@@ -52,6 +142,28 @@ class TestAccounts(TestCaseWithAuth):
         )
         self.assertTrue(resp.is_success)
 
+    def test_update_profile_keeps_concurrent_changes(self):
+        profile_url = v1_router.url_path_for("Get user profile")
+        self.assertTrue(self.auth_client.get(profile_url).is_success)
+        # Changed by another process, the cached user isn't evicted
+        CustomUser.objects.filter(pk=self.user.pk).update(
+            password="changed-elsewhere",
+            token_version=self.user.token_version + 1,
+        )
+        try:
+            resp = self.auth_client.patch(
+                v1_router.url_path_for("Update user profile"),
+                json={"first_name": self.user.first_name},
+            )
+            self.assertTrue(resp.is_success)
+            user = CustomUser.objects.get(pk=self.user.pk)
+            self.assertEqual(user.password, "changed-elsewhere")
+            self.assertEqual(user.token_version, self.user.token_version + 1)
+        finally:
+            self.user.refresh_from_db()
+            self.user.set_password(test_credentials["password"])
+            self.user.save()
+
     def test_username_existence_check(self):
         for username, existence_status in [
             (test_credentials["username"], True),
@@ -127,20 +239,90 @@ class TestAccounts(TestCaseWithAuth):
         self.assertTrue(resp.is_success)
 
     def test_reset_password(self):
-        resp = client.get(
-            v1_router.url_path_for("Send password reset token"),
-            params=dict(identity=self.user.username),
-        )
+        with patch(
+            "api.v1.account.routes.generate_password_reset_token",
+            return_value="0IJ4826L",
+        ):
+            resp = client.get(
+                v1_router.url_path_for("Send password reset token"),
+                params=dict(identity=self.user.username),
+            )
         self.assertTrue(resp.is_success)
+        # Only the token's hash is stored
         token = AuthToken.objects.get(user=self.user)
+        self.assertEqual(token.token_hash, AuthToken.hash_token("0IJ4826L"))
+        resp = client.post(
+            v1_router.url_path_for("Set new account password"),
+            json=ResetPassword(
+                username="she73yw234x34339",
+                new_password="_Clb03042003",
+                token="0IJ4826L",
+            ).model_dump(),
+        )
+        self.assertEqual(resp.status_code, 400)
         resp = client.post(
             v1_router.url_path_for("Set new account password"),
             json=ResetPassword(
                 username=self.user.username,
                 new_password="_Clb03042003",
-                token=token.token,
+                token="0IJ4826L",
             ).model_dump(),
         )
         self.assertTrue(resp.is_success)
         self.user.set_password(test_credentials["password"])
         self.user.save()
+
+    def test_delete_expired_auth_tokens(self):
+        AuthToken.objects.filter(user=self.user).delete()
+        AuthToken.objects.create(
+            user=self.user,
+            token_hash=AuthToken.hash_token("EXPIRED0"),
+            expiry_datetime=timezone.now() - timedelta(minutes=1),
+        )
+        self.assertEqual(AuthToken.delete_expired(chunk_size=1), 1)
+        self.assertFalse(AuthToken.objects.filter(user=self.user).exists())
+
+
+class TestPasswordHasherPool(TestCase):
+    def test_rejects_when_saturated(self):
+        hasher = PasswordHasherPool(max_workers=1, max_pending=0)
+        self.assertEqual(asyncio.run(hasher.run(sum, [1, 2])), 3)
+
+        hasher.pending = 1
+        with self.assertRaises(HTTPException) as context:
+            asyncio.run(hasher.run(sum, [1, 2]))
+        self.assertEqual(context.exception.status_code, 503)
+        self.assertEqual(hasher.stats()["rejected"], 1)
+
+
+class TestUsernameIndex(TestCase):
+    def test_modes(self):
+        for mode in ("set", "bloom"):
+            index = UsernameIndex(mode=mode)
+            index.load()
+            self.assertTrue(
+                asyncio.run(index.aexists(test_credentials["username"]))
+            )
+            self.assertFalse(asyncio.run(index.aexists("she73yw234x34339")))
+            index.add("she73yw234x34339")
+            self.assertEqual(
+                asyncio.run(index.aexists("she73yw234x34339")), mode == "set"
+            )
+            stats = index.stats()
+            self.assertGreater(stats["memory_bytes"], 0)
+            self.assertGreaterEqual(stats["false_positive_rate"], 0)
+
+    def test_unindexed_usernames_confirmed_by_db(self):
+        index = UsernameIndex(mode="set")
+        index.load()
+        self.assertFalse(asyncio.run(index.aexists("she73yw234x34339")))
+        self.assertEqual(index.stats()["db_lookups"], 1)
+
+        index = UsernameIndex(mode="set", cache_alias="default")
+        index.load()
+        self.assertFalse(asyncio.run(index.aexists("she73yw234x34339")))
+        self.assertEqual(index.stats()["db_lookups"], 0)
+        # Signed up through another worker
+        UsernameIndex(cache_alias="default").publish_generation()
+        self.assertFalse(asyncio.run(index.aexists("she73yw234x34339")))
+        self.assertEqual(index.stats()["db_lookups"], 1)
@@ -2,12 +2,14 @@ from unittest import TestCase
 
 from django.db import IntegrityError
 from external._enums import DocumentName
-from external.models import About, Document
+from external.models import FAQ, About, Document
 from management._enums import UtilityName
 from management.models import AppUtility
+from users.models import CustomUser
 
 from api import v1_router
-from api.tests import client
+from api.routing import response_cache
+from api.tests import client, test_credentials
 from api.tests.utils import get_model_example
 from api.v1.business.models import BusinessAbout, NewVisitorMessage
 
@@ -42,6 +44,51 @@ class TestBusiness(TestCase):
         resp = client.get(v1_router.url_path_for("Frequently asked questions"))
         self.assertTrue(resp.is_success)
 
+    def test_feedbacks_cache_eviction(self):
+        response_cache.clear()
+        resp = client.get(v1_router.url_path_for("Customers' feedback"))
+        self.assertTrue(resp.is_success)
+        self.assertEqual(len(response_cache), 1)
+
+        user = CustomUser.objects.get(username=test_credentials["username"])
+        # Not shown in feedbacks
+        user.save(update_fields=["last_login"])
+        self.assertEqual(len(response_cache), 1)
+        user.save(update_fields=["first_name"])
+        self.assertEqual(len(response_cache), 0)
+
+    def test_cache_key_ignores_undeclared_params(self):
+        response_cache.clear()
+        url = v1_router.url_path_for("App utilities")
+        for params in ({}, {"junk": "1"}, {"junk": "2"}):
+            self.assertTrue(client.get(url, params=params).is_success)
+        self.assertEqual(len(response_cache), 1)
+
+        resp = client.get(url, params={"name": UtilityName.CURRENCY.value})
+        self.assertTrue(resp.is_success)
+        self.assertEqual(len(response_cache), 2)
+
+    def test_faqs_etag(self):
+        url = v1_router.url_path_for("Frequently asked questions")
+        resp = client.get(url)
+        etag = resp.headers["ETag"]
+        self.assertIn("max-age", resp.headers["Cache-Control"])
+
+        resp = client.get(url, headers={"If-None-Match": f"W/{etag}"})
+        self.assertEqual(resp.status_code, 304)
+        self.assertEqual(resp.content, b"")
+
+        faq = FAQ.objects.create(question="Automated?", answer="Yes", index=-1)
+        try:
+            resp = client.get(url, headers={"If-None-Match": etag})
+            self.assertEqual(resp.status_code, 200)
+            self.assertNotEqual(resp.headers["ETag"], etag)
+            self.assertIn(
+                faq.question, [entry["question"] for entry in resp.json()]
+            )
+        finally:
+            faq.delete()
+
     def test_document(self):
         document_name = DocumentName.TERMS_OF_USE.value
         document = Document.objects.create(
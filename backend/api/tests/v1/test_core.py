@@ -0,0 +1,64 @@
+import json
+
+from management.models import Concern
+
+from api import v1_router
+from api.tests.v1.test_accounts import TestCaseWithAuth
+from api.v1.core.models import ConcernDetails, NewConcern
+
+
+class TestCore(TestCaseWithAuth):
+    def test_concerns(self):
+        resp = self.auth_client.post(
+            v1_router.url_path_for("Add new concern"),
+            json=NewConcern(
+                about="Service Quality", details="Automated test."
+            ).model_dump(),
+        )
+        self.assertTrue(resp.is_success)
+        concern = ConcernDetails(**resp.json())
+
+        resp = self.auth_client.get(v1_router.url_path_for("Get concerns"))
+        self.assertTrue(resp.is_success)
+        self.assertIn(concern.id, [entry["id"] for entry in resp.json()])
+
+        resp = self.auth_client.get(
+            v1_router.url_path_for("Get concern details", id=concern.id)
+        )
+        self.assertTrue(resp.is_success)
+        Concern.objects.filter(id=concern.id).delete()
+
+    def test_group_messages(self):
+        resp = self.auth_client.get(
+            v1_router.url_path_for("Get group messages"),
+            params=dict(is_read=False),
+        )
+        self.assertTrue(resp.is_success)
+
+    def test_server_timing(self):
+        resp = self.auth_client.get(v1_router.url_path_for("Get concerns"))
+        self.assertTrue(resp.is_success)
+        phases = {
+            metric.split(";")[0].strip()
+            for metric in resp.headers["Server-Timing"].split(",")
+        }
+        self.assertTrue({"auth", "serialize", "total"}.issubset(phases))
+
+    def test_query_budget(self):
+        with self.assertMaxQueries(3, repeat_threshold=2):
+            resp = self.auth_client.get(v1_router.url_path_for("Get concerns"))
+        self.assertTrue(resp.is_success)
+
+    def test_access_log(self):
+        with self.assertLogs("api.access") as logs:
+            resp = self.auth_client.get(
+                v1_router.url_path_for("Get concerns"),
+                headers={"X-Request-ID": "test-access-log"},
+            )
+        self.assertEqual(resp.headers["X-Request-ID"], "test-access-log")
+        entry = json.loads(logs.records[-1].getMessage())
+        self.assertEqual(entry["request_id"], "test-access-log")
+        self.assertEqual(entry["route"], "Get concerns")
+        self.assertEqual(entry["user_id"], self.user.id)
+        self.assertEqual(entry["status"], 200)
+        self.assertIsInstance(entry["queries"], int)
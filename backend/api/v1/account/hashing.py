@@ -0,0 +1,108 @@
+"""Password hashing off the event loop and away from the default executor.
+
+PBKDF2 keeps a CPU busy for tens of milliseconds per call. Running it in the
+default executor makes a burst of logins compete with every async ORM call,
+so hashing gets its own bounded pool that rejects work once saturated.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.hashers import make_password, verify_password
+from fastapi import HTTPException, status
+from project.settings import env_setting
+from users.models import CustomUser
+
+
+class PasswordHasherPool:
+    """Thread-pool for password hashing with a concurrency cap.
+
+    hashlib releases the GIL while deriving keys hence threads hash in
+    parallel. Calls beyond `max_workers + max_pending` are rejected with
+    `503` instead of queueing indefinitely.
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 32):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.pending = 0
+        """Calls currently running or queued"""
+        self.rejected = 0
+        self._executor: ThreadPoolExecutor | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_workers > 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Calls waiting for a free worker"""
+        return max(self.pending - self.max_workers, 0)
+
+    def resize(self, max_workers: int) -> None:
+        """Change number of workers. `0` disables the pool"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        self.max_workers = max_workers
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "workers": self.max_workers,
+            "pending": self.pending,
+            "queue_depth": self.queue_depth,
+            "rejected": self.rejected,
+        }
+
+    async def run(self, func, *args):
+        if self.pending >= self.max_workers + self.max_pending:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy. Try again shortly.",
+                headers={"Retry-After": "1"},
+            )
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="password-hasher",
+            )
+
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, func, *args
+            )
+        finally:
+            self.pending -= 1
+
+    async def check_password(self, user: CustomUser, raw_password: str) -> bool:
+        """Pooled equivalent of `user.acheck_password`"""
+        if not self.enabled:
+            return await user.acheck_password(raw_password)
+
+        is_correct, must_update = await self.run(
+            verify_password, raw_password, user.password
+        )
+        if is_correct and must_update:
+            await self.set_password(user, raw_password)
+            # Password hash upgrades shouldn't be considered password changes.
+            user._password = None
+            await user.asave(update_fields=["password"])
+        return is_correct
+
+    async def set_password(self, user: CustomUser, raw_password: str) -> None:
+        """Pooled equivalent of `user.set_password`"""
+        if not self.enabled:
+            user.set_password(raw_password)
+            return
+
+        user.password = await self.run(make_password, raw_password)
+        user._password = raw_password
+
+
+password_hasher = PasswordHasherPool(
+    max_workers=env_setting.PASSWORD_HASHER_WORKERS,
+    max_pending=env_setting.PASSWORD_HASHER_MAX_PENDING,
+)
@@ -15,9 +15,14 @@ from fastapi.encoders import jsonable_encoder
 from fastapi.security.oauth2 import OAuth2PasswordRequestFormStrict
 from finance._enums import TransactionMeans, TransactionType
 from finance.models import Account, Transaction
+from project.settings import env_setting
 from project.utils import get_expiry_datetime
+from users.cache import username_index
 from users.models import AuthToken, CustomUser
 
+from api.dependencies.security.rate_limit import RateLimiter
+from api.routing import TimedAPIRoute
+from api.v1.account.hashing import password_hasher
 from api.v1.account.models import (
     EditablePersonalData,
     PaymentAccountDetails,
@@ -29,20 +34,38 @@ from api.v1.account.models import (
 )
 from api.v1.account.utils import (
     generate_password_reset_token,
+    generate_signed_token,
     generate_token,
     get_user,
+    get_user_contact,
+    get_user_id,
+    get_user_with_account,
+    revoke_tokens,
 )
 from api.v1.models import ProcessFeedback
-from finance.models import UserAccount
 from api.v1.utils import get_value, send_email
 
 router = APIRouter(
     prefix="/account",
     tags=["Account"],
+    route_class=TimedAPIRoute,
 )
 
 
-@router.post("/token", name="User auth token")
+@router.post(
+    "/token",
+    name="User auth token",
+    dependencies=[
+        Depends(
+            RateLimiter(
+                "token",
+                env_setting.RATE_LIMIT_TOKEN,
+                "username",
+                ip_rate=env_setting.RATE_LIMIT_TOKEN_IP,
+            )
+        )
+    ],
+)
 async def fetch_token(
     form_data: Annotated[OAuth2PasswordRequestFormStrict, Depends()],
 ) -> TokenAuth:
@@ -51,10 +74,15 @@ async def fetch_token(
     """
     try:
         user = await CustomUser.objects.aget(username=form_data.username)
-        if await user.acheck_password(form_data.password):
+        if await password_hasher.check_password(user, form_data.password):
+            if env_setting.AUTH_SIGNED_TOKENS:
+                return TokenAuth(
+                    access_token=generate_signed_token(user),
+                    token_type="bearer",
+                )
             if user.token is None:
                 user.token = generate_token()
-                await user.asave()
+                await user.asave(update_fields=["token"])
             return TokenAuth(
                 access_token=user.token,
                 token_type="bearer",
@@ -75,19 +103,22 @@ async def fetch_token(
 async def generate_new_token(
     user: Annotated[CustomUser, Depends(get_user)],
 ) -> TokenAuth:
-    """Generate new token"""
-    user.token = generate_token()
-    await user.asave()
+    """Generate new token. Previously issued tokens are revoked"""
+    # The cached user may predate changes made by other workers
+    user = await CustomUser.objects.aget(pk=user.pk)
+    revoke_tokens(user)
+    await user.asave(update_fields=["token", "token_version"])
+    if env_setting.AUTH_SIGNED_TOKENS:
+        return TokenAuth(access_token=generate_signed_token(user))
     return TokenAuth(access_token=user.token)
 
 
 @router.get("/profile", name="Get user profile")
 async def profile_information(
-    user: Annotated[CustomUser, Depends(get_user)],
+    user: Annotated[CustomUser, Depends(get_user_with_account)],
 ) -> UserProfile:
-    user_account = await UserAccount.objects.aget(id=user.account.id)
     user_details = user.model_dump()
-    user_details["account_balance"] = user_account.balance
+    user_details["account_balance"] = user.account.balance
     return user_details
 
 
@@ -105,26 +136,40 @@ async def update_personal_info(
     )
     user.email = get_value(updated_personal_data.email, user.email)
     user.address = get_value(updated_personal_data.address, user.address)
-    await user.asave()
+    # Saving the whole (possibly cached) row would overwrite the password
+    # & token version changed by other workers
+    await user.asave(
+        update_fields=[
+            "first_name",
+            "last_name",
+            "phone_number",
+            "email",
+            "address",
+        ]
+    )
     return user.model_dump()
 
 
-@router.get("/exists", name="Check if username exists")
+@router.get(
+    "/exists",
+    name="Check if username exists",
+    dependencies=[
+        Depends(RateLimiter("exists", env_setting.RATE_LIMIT_USERNAME_CHECK))
+    ],
+)
 async def check_if_username_exists(
     username: Annotated[str, Query(description="Username to check against")],
 ) -> ProcessFeedback:
     """Checks if account with a particular username exists
     - Useful when setting username at account creation
     """
-    existance_status = (
-        await CustomUser.objects.filter(username=username).afirst() is not None
-    )
+    existance_status = await username_index.aexists(username)
     return ProcessFeedback(detail=existance_status)
 
 
 @router.get("/transactions", name="Financial transactions")
 async def get_financial_transactions(
-    user: Annotated[CustomUser, Depends(get_user)],
+    user_id: Annotated[int, Depends(get_user_id)],
     means: Annotated[
         TransactionMeans,
         Query(description="Transaction means"),
@@ -134,7 +179,7 @@ async def get_financial_transactions(
     ] = None,
 ) -> list[TransactionInfo]:
     """Get complete financial transactions"""
-    search_filter = dict(user=user)
+    search_filter = dict(user_id=user_id)
     if means is not None:
         search_filter["means"] = means.value
     if type is not None:
@@ -151,7 +196,7 @@ async def get_financial_transactions(
     "/mpesa-payment-account-details", name="M-Pesa payment account details"
 )
 async def get_mpesa_payment_account_details(
-    user: Annotated[CustomUser, Depends(get_user)],
+    user: Annotated[CustomUser, Depends(get_user_contact)],
 ) -> PaymentAccountDetails:
     """Get mpesa payment account details specifically for current user"""
     try:
@@ -181,7 +226,7 @@ async def get_mpesa_payment_account_details(
     "/other-payment-account-details", name="Other payment account details"
 )
 async def get_payment_account_details(
-    user: Annotated[CustomUser, Depends(get_user)],
+    user: Annotated[CustomUser, Depends(get_user_contact)],
 ) -> list[PaymentAccountDetails]:
     """Get other payment account details such as bank etc."""
     return [
@@ -205,7 +250,7 @@ async def get_payment_account_details(
 
 @router.post("/send-mpesa-payment-popup", name="Send mpesa payment popup")
 async def send_mpesa_popup_to(
-    user: Annotated[CustomUser, Depends(get_user)],
+    user: Annotated[CustomUser, Depends(get_user_contact)],
     popup_to: SendMPESAPopupTo,
 ) -> ProcessFeedback:
     """Send mpesa payment pop-up to user"""
@@ -245,7 +290,18 @@ async def send_mpesa_popup_to(
 
 
 @router.get(
-    "/password/send-password-reset-token", name="Send password reset token"
+    "/password/send-password-reset-token",
+    name="Send password reset token",
+    dependencies=[
+        Depends(
+            RateLimiter(
+                "password-reset",
+                env_setting.RATE_LIMIT_PASSWORD_RESET,
+                "identity",
+                ip_rate=env_setting.RATE_LIMIT_PASSWORD_RESET_IP,
+            )
+        )
+    ],
 )
 async def reset_password(
     identity: Annotated[str, Query(description="Username or email address")],
@@ -255,23 +311,22 @@ async def reset_password(
         target_user = await CustomUser.objects.filter(
             Q(username=identity) | Q(email=identity)
         ).aget()
-        auth_token = await AuthToken.objects.filter(user=target_user).afirst()
-        if auth_token is not None:
-            auth_token.token = generate_password_reset_token()
-            auth_token.expiry_datetime = get_expiry_datetime()
-        else:
-            auth_token = await AuthToken.objects.acreate(
-                user=target_user,
-                token=generate_password_reset_token(),
-            )
-        await auth_token.asave()
+        token = generate_password_reset_token()
+        auth_token, _ = await AuthToken.objects.aupdate_or_create(
+            user=target_user,
+            defaults=dict(
+                token_hash=AuthToken.hash_token(token),
+                expiry_datetime=get_expiry_datetime(),
+            ),
+        )
+        auth_token.user = target_user
         await asyncio.to_thread(
             send_email,
             **dict(
                 subject="Password Reset Token",
-                recipient=auth_token.user.email,
+                recipient=target_user.email,
                 template_name="email/password_reset_token",
-                context=dict(auth_token=auth_token),
+                context=dict(auth_token=auth_token, token=token),
             ),
         )
 
@@ -293,7 +348,8 @@ async def set_new_password(info: ResetPassword) -> ProcessFeedback:
     """Resets user account password"""
     try:
         auth_token = await AuthToken.objects.select_related("user").aget(
-            token=info.token
+            user__username=info.username,
+            token_hash=AuthToken.hash_token(info.token),
         )
         if auth_token.is_expired():
             raise HTTPException(
@@ -301,17 +357,11 @@ async def set_new_password(info: ResetPassword) -> ProcessFeedback:
                 detail="Token has expired.",
             )
         user = auth_token.user
-        if user.username == info.username:
-            user.set_password(info.new_password)
-            user.token = generate_token()
-            await user.asave()
-            await auth_token.adelete()
-            return ProcessFeedback(detail="Password reset successfully.")
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid username",
-            )
+        await password_hasher.set_password(user, info.new_password)
+        revoke_tokens(user)
+        await user.asave(update_fields=["password", "token", "token_version"])
+        await auth_token.adelete()
+        return ProcessFeedback(detail="Password reset successfully.")
 
     except AuthToken.DoesNotExist:
         raise HTTPException(
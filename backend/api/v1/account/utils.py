@@ -1,17 +1,23 @@
 """Utility functions for user fastapi-app"""
 
-import random
-import uuid
-from string import ascii_lowercase
+import secrets
 from typing import Annotated
 
+from django.db.models import QuerySet
 from fastapi import Depends, HTTPException, status
 from fastapi.security.oauth2 import OAuth2PasswordBearer
-from project.utils import generate_random_token
+from finance.models import UserAccount
+from project.utils.telemetry import measure, request_telemetry
 from users.models import CustomUser
-
-token_id = "lms_"
-"""First characters of every user auth-token"""
+from users.tokens import (  # noqa: F401
+    aget_user_by_token,
+    generate_signed_token,
+    generate_token,
+    read_signed_token,
+    revoke_tokens,
+    signed_token_id,
+    token_id,
+)
 
 v1_auth_scheme = OAuth2PasswordBearer(
     tokenUrl="/api/v1/account/token",
@@ -19,34 +25,60 @@ v1_auth_scheme = OAuth2PasswordBearer(
 )
 
 
+async def resolve_user(token: str | None, queryset: QuerySet, projection: str):
+    """Like `aget_user_by_token` but responds with 401 when not found"""
+    with measure("auth"):
+        user = await aget_user_by_token(token, queryset, projection)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or missing token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    telemetry = request_telemetry.get()
+    if telemetry is not None:
+        telemetry.user_id = getattr(user, "pk", user)
+    return user
+
+
+async def get_user_id(
+    token: Annotated[str, Depends(v1_auth_scheme)],
+) -> int:
+    """ID of the user owning the token. Lightest user dependency"""
+    return await resolve_user(
+        token, CustomUser.objects.values_list("id", flat=True), "id"
+    )
+
+
+async def get_user_contact(
+    token: Annotated[str, Depends(v1_auth_scheme)],
+) -> CustomUser:
+    """User with only id, username, email & phone number loaded.
+
+    Accessing other fields triggers a (sync) query, avoid them.
+    """
+    return await resolve_user(
+        token,
+        CustomUser.objects.only("id", "username", "email", "phone_number"),
+        "contact",
+    )
+
+
 async def get_user(
     token: Annotated[str, Depends(v1_auth_scheme)],
 ) -> CustomUser:
     """Ensures token passed match the one set"""
-    if token:
-        try:
-            if token.startswith(token_id):
-                user = await CustomUser.objects.select_related("account").aget(
-                    token=token
-                )
-                return user
-
-        except CustomUser.DoesNotExist:
-            pass
-
-    raise HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Invalid or missing token",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+    return await resolve_user(token, CustomUser.objects.all(), "user")
 
 
-def generate_token() -> str:
-    """Generates api token"""
-    return token_id + str(uuid.uuid4()).replace(
-        "-", random.choice(ascii_lowercase)
-    )
+async def get_user_with_account(
+    user: Annotated[CustomUser, Depends(get_user)],
+) -> CustomUser:
+    """User with up-to-date finance account loaded"""
+    user.account = await UserAccount.objects.aget(pk=user.account_id)
+    return user
 
 
-def generate_password_reset_token(length: int = 8) -> str:
-    return generate_random_token(length)
+def generate_password_reset_token(nbytes: int = 16) -> str:
+    return secrets.token_urlsafe(nbytes)
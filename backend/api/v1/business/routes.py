@@ -13,7 +13,10 @@ from external.models import (
 from fastapi import APIRouter, HTTPException, Query, status
 from management._enums import UtilityName
 from management.models import AppUtility
+from project.utils.models import amodel_dump_many
+from users.models import CustomUser
 
+from api.routing import CachedAPIRoute, cache_response
 from api.v1.business.models import (
     AppUtilityInfo,
     BusinessAbout,
@@ -27,10 +30,13 @@ from api.v1.business.models import (
 from api.v1.models import ProcessFeedback
 from api.v1.utils import send_email
 
-router = APIRouter(prefix="/business", tags=["Business"])
+router = APIRouter(
+    prefix="/business", tags=["Business"], route_class=CachedAPIRoute
+)
 
 
 @router.get("/about", name="Business information")
+@cache_response(About)
 async def get_business_details() -> BusinessAbout:
     about = await About.objects.all().alast()
     if about is not None:
@@ -64,6 +70,7 @@ async def new_visitor_message(
 
 
 @router.get("/galleries", name="Business galleries")
+@cache_response(Gallery)
 async def get_business_galleries() -> list[BusinessGallery]:
     return [
         gallery.model_dump()
@@ -74,23 +81,28 @@ async def get_business_galleries() -> list[BusinessGallery]:
 
 
 @router.get("/feedbacks", name="Customers' feedback")
+@cache_response(
+    ServiceFeedback,
+    CustomUser,
+    # e.g last_login updates of the senders don't change the response
+    fields={CustomUser: tuple(ShallowUserInfo.model_fields)},
+)
 async def get_client_feedbacks() -> list[UserFeedback]:
     """Get customers' feedback"""
-    feedbacks = (
-        ServiceFeedback.objects.filter(show_in_index=True)
-        .prefetch_related("sender")
-        .order_by("list_index")
-        .all()[:14]
+    feedbacks = await amodel_dump_many(
+        ServiceFeedback.objects.filter(show_in_index=True).order_by(
+            "list_index"
+        )[:14],
+        relations=["sender"],
     )
-    feedback_list = []
-    async for feedback in feedbacks:
-        feedback_dict = feedback.model_dump()
-        feedback_dict["user"] = ShallowUserInfo(**feedback.sender.model_dump())
-        feedback_list.append(UserFeedback(**feedback_dict))
-    return feedback_list
+    return [
+        UserFeedback(**feedback, user=ShallowUserInfo(**feedback["sender"]))
+        for feedback in feedbacks
+    ]
 
 
 @router.get("/faqs", name="Frequently asked questions")
+@cache_response(FAQ)
 async def get_faqs() -> list[FAQDetails]:
     """Get frequently asked question"""
     return [
@@ -102,6 +114,7 @@ async def get_faqs() -> list[FAQDetails]:
 
 
 @router.get("/document", name="Site document")
+@cache_response(Document, cache_control="public, max-age=3600")
 async def get_site_document(
     name: Annotated[DocumentName, Query(description="Document name")],
 ) -> DocumentInfo:
@@ -116,6 +129,7 @@ async def get_site_document(
 
 
 @router.get("/app/utilities", name="App utilities")
+@cache_response(AppUtility)
 async def get_app_utilities(
     name: Annotated[UtilityName, Query(description="Name filter")] = None,
 ) -> list[AppUtilityInfo]:
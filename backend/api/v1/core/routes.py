@@ -16,12 +16,13 @@ from management._enums import ConcernStatus
 from management.models import (
     Concern,
     GroupMessage,
+    MemberGroup,
     MessageCategory,
     PersonalMessage,
 )
-from users.models import CustomUser
 
-from api.v1.account.utils import get_user
+from api.routing import TimedAPIRoute
+from api.v1.account.utils import get_user_id
 from api.v1.core.models import (
     ConcernDetails,
     GroupMessageInfo,
@@ -35,21 +36,21 @@ from api.v1.core.models import (
 from api.v1.models import ProcessFeedback
 from api.v1.utils import get_value
 
-router = APIRouter(prefix="/core", tags=["Core"])
+router = APIRouter(prefix="/core", tags=["Core"], route_class=TimedAPIRoute)
 
 # TODO: Implement your other routers here
 
 
 @router.get("/personal/messages", name="Get personal messages")
 async def get_personal_messages(
-    user: Annotated[CustomUser, Depends(get_user)],
+    user_id: Annotated[int, Depends(get_user_id)],
     is_read: Annotated[bool, Query(description="Is read filter")] = None,
     category: Annotated[
         MessageCategory, Query(description="Messages category")
     ] = None,
 ) -> list[PersonalMessageInfo]:
     """Messages that targets one user"""
-    search_filter = dict(user=user)
+    search_filter = dict(user_id=user_id)
     if is_read is not None:
         search_filter["is_read"] = is_read
     if category is not None:
@@ -68,11 +69,11 @@ async def get_personal_messages(
 )
 async def mark_personal_message_read(
     id: Annotated[int, Path(description="Personal message ID")],
-    user: Annotated[CustomUser, Depends(get_user)],
+    user_id: Annotated[int, Depends(get_user_id)],
 ) -> ProcessFeedback:
     """Mark a personal message as read"""
     try:
-        await PersonalMessage.objects.filter(id=id, user=user).aupdate(
+        await PersonalMessage.objects.filter(id=id, user_id=user_id).aupdate(
             is_read=True
         )
         return ProcessFeedback(detail="Message marked as read successfully")
@@ -85,7 +86,7 @@ async def mark_personal_message_read(
 
 @router.get("/group/messages", name="Get group messages")
 async def get_group_messages(
-    user: Annotated[CustomUser, Depends(get_user)],
+    user_id: Annotated[int, Depends(get_user_id)],
     is_read: Annotated[bool, Query(description="Is read filter")] = None,
     category: Annotated[
         MessageCategory, Query(description="Messages category")
@@ -95,12 +96,15 @@ async def get_group_messages(
     message_list = []
     search_filter = dict(
         groups__in=[
-            member_group async for member_group in user.member_groups.all()
+            member_group
+            async for member_group in MemberGroup.objects.filter(
+                members=user_id
+            )
         ]
     )
     if is_read is not None:
         if is_read:
-            search_filter["read_by"] = user
+            search_filter["read_by"] = user_id
         elif is_read is False:
             search_filter["read_by__isnull"] = True
     if category is not None:
@@ -113,7 +117,9 @@ async def get_group_messages(
         .all()[:30]
     ):
         message_dict = message.model_dump()
-        message_dict["is_read"] = await message.read_by.acontains(user)
+        message_dict["is_read"] = await message.read_by.filter(
+            id=user_id
+        ).aexists()
         message_list.append(message_dict)
     return message_list
 
@@ -123,7 +129,7 @@ async def get_group_messages(
 )
 async def mark_group_message_read(
     id: Annotated[int, Path(description="Group message ID")],
-    user: Annotated[CustomUser, Depends(get_user)],
+    user_id: Annotated[int, Depends(get_user_id)],
 ) -> ProcessFeedback:
     """Mark a particular group message as read"""
     try:
@@ -132,10 +138,13 @@ async def mark_group_message_read(
         ).aget(
             id=id,
             groups__in=[
-                member_group async for member_group in user.member_groups.all()
+                member_group
+                async for member_group in MemberGroup.objects.filter(
+                    members=user_id
+                )
             ],
         )
-        await target_message.read_by.aadd(user)
+        await target_message.read_by.aadd(user_id)
         return ProcessFeedback(detail="Message marked as read successfully.")
     except GroupMessage.DoesNotExist:
         raise HTTPException(
@@ -146,13 +155,13 @@ async def mark_group_message_read(
 
 @router.get("/concerns", name="Get concerns")
 async def get_concerns(
-    user: Annotated[CustomUser, Depends(get_user)],
+    user_id: Annotated[int, Depends(get_user_id)],
     status: Annotated[
         ConcernStatus, Query(description="Concern status")
     ] = None,
 ) -> list[ShallowConcernDetails]:
     """Get concerns ever sent"""
-    search_filter = dict(user=user)
+    search_filter = dict(user_id=user_id)
     if status is not None:
         search_filter["status"] = status.value
     return [
@@ -165,11 +174,11 @@ async def get_concerns(
 
 @router.post("/concern/new", name="Add new concern")
 async def add_new_concern(
-    concern: NewConcern, user: Annotated[CustomUser, Depends(get_user)]
+    concern: NewConcern, user_id: Annotated[int, Depends(get_user_id)]
 ) -> ConcernDetails:
     """Add new concern"""
     new_concern_dict = concern.model_dump()
-    new_concern_dict["user"] = user
+    new_concern_dict["user_id"] = user_id
     new_concern = await Concern.objects.acreate(**new_concern_dict)
     # new_concern.refresh_from_db()
     return new_concern.model_dump()
@@ -179,13 +188,13 @@ async def add_new_concern(
 async def update_existing_concern(
     id: Annotated[int, Path(description="Concern ID")],
     concern: UpdateConcern,
-    user: Annotated[CustomUser, Depends(get_user)],
+    user_id: Annotated[int, Depends(get_user_id)],
 ) -> ConcernDetails:
     """Update existing concern"""
     try:
         target_concern = await Concern.objects.aget(
             id=id,
-            user=user,
+            user_id=user_id,
             status__in=[
                 ConcernStatus.OPEN.value,
                 ConcernStatus.IN_PROGRESS.value,
@@ -207,11 +216,11 @@ async def update_existing_concern(
 @router.get("/concern/{id}", name="Get concern details")
 async def get_concern_details(
     id: Annotated[int, Path(description="Concern ID")],
-    user: Annotated[CustomUser, Depends(get_user)],
+    user_id: Annotated[int, Depends(get_user_id)],
 ) -> ConcernDetails:
     """Get particular concern details"""
     try:
-        target_concern = await Concern.objects.aget(id=id, user=user)
+        target_concern = await Concern.objects.aget(id=id, user_id=user_id)
         return target_concern.model_dump()
     except Concern.DoesNotExist:
         raise HTTPException(
@@ -223,11 +232,11 @@ async def get_concern_details(
 @router.delete("/concern/{id}", name="Delete concern")
 async def delete_concern_details(
     id: Annotated[int, Path(description="Concern ID")],
-    user: Annotated[CustomUser, Depends(get_user)],
+    user_id: Annotated[int, Depends(get_user_id)],
 ) -> ProcessFeedback:
     """Delete a particular concern"""
     try:
-        target_concern = await Concern.objects.aget(id=id, user=user)
+        target_concern = await Concern.objects.aget(id=id, user_id=user_id)
         await target_concern.adelete()
         return ProcessFeedback(detail="Concern deleted successfully.")
     except Concern.DoesNotExist:
@@ -239,12 +248,14 @@ async def delete_concern_details(
 
 @router.post("/feedback", name="New feedback")
 async def add_new_feedback(
-    user: Annotated[CustomUser, Depends(get_user)],
+    user_id: Annotated[int, Depends(get_user_id)],
     feedback: NewUserFeedback,
 ) -> UserFeedbackDetails:
     try:
         new_feedback = await ServiceFeedback.objects.acreate(
-            sender=user, message=feedback.message, rate=feedback.rate.value
+            sender_id=user_id,
+            message=feedback.message,
+            rate=feedback.rate.value,
         )
         return new_feedback.model_dump()
     except IntegrityError:
@@ -259,12 +270,12 @@ async def add_new_feedback(
 
 @router.patch("/feedback", name="Update feedback")
 async def update_feedback(
-    user: Annotated[CustomUser, Depends(get_user)],
+    user_id: Annotated[int, Depends(get_user_id)],
     feedback: NewUserFeedback,
 ) -> UserFeedbackDetails:
     """Update user service-feedback"""
     try:
-        target_feedback = await ServiceFeedback.objects.aget(sender=user)
+        target_feedback = await ServiceFeedback.objects.aget(sender_id=user_id)
         target_feedback.message = get_value(
             feedback.message, target_feedback.message
         )
@@ -282,11 +293,11 @@ async def update_feedback(
 
 @router.get("/feedback", name="Get feedback details")
 async def get_feedback_details(
-    user: Annotated[CustomUser, Depends(get_user)],
+    user_id: Annotated[int, Depends(get_user_id)],
 ) -> UserFeedbackDetails:
     """Get user service-feedback"""
     try:
-        target_feedback = await ServiceFeedback.objects.aget(sender=user)
+        target_feedback = await ServiceFeedback.objects.aget(sender_id=user_id)
         return target_feedback.model_dump()
     except ServiceFeedback.DoesNotExist:
         raise HTTPException(
@@ -297,11 +308,11 @@ async def get_feedback_details(
 
 @router.delete("/feedback", name="Delete feedback")
 async def delete_feedback(
-    user: Annotated[CustomUser, Depends(get_user)],
+    user_id: Annotated[int, Depends(get_user_id)],
 ) -> ProcessFeedback:
     """Delete user feedback"""
     try:
-        target_feedback = await ServiceFeedback.objects.aget(sender=user)
+        target_feedback = await ServiceFeedback.objects.aget(sender_id=user_id)
         await target_feedback.adelete()
         return ProcessFeedback(detail="Feedback deleted successfully.")
     except ServiceFeedback.DoesNotExist:
@@ -0,0 +1,6 @@
+"""Performance benchmarks. Run from the backend directory e.g.
+
+```sh
+python -m benchmarks.login_throughput
+```
+"""
@@ -0,0 +1,89 @@
+"""Login throughput with and without the password hashing pool.
+
+Fires a burst of concurrent `POST /account/token` requests while polling
+`GET /business/faqs`, then reports logins per second and the latency of the
+unrelated route. Requires the `developer` user
+(see `make developmentsuperuser`).
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+from api import app, v1_router
+from api.tests import base_url, test_credentials
+from api.v1.account.hashing import password_hasher
+from project.settings import env_setting
+
+
+async def poll(client: httpx.AsyncClient, url: str, stop: asyncio.Event):
+    latencies = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.get(url)
+        latencies.append(time.perf_counter() - start)
+        # Cached responses are served without yielding to the event loop
+        await asyncio.sleep(0)
+    return latencies
+
+
+async def run(logins: int, concurrency: int) -> dict:
+    token_url = v1_router.url_path_for("User auth token")
+    faqs_url = v1_router.url_path_for("Frequently asked questions")
+    semaphore = asyncio.Semaphore(concurrency)
+    succeeded = rejected = 0
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url=base_url
+    ) as client:
+
+        async def login():
+            nonlocal succeeded, rejected
+            async with semaphore:
+                resp = await client.post(token_url, data=test_credentials)
+                if resp.status_code == 200:
+                    succeeded += 1
+                elif resp.status_code == 503:
+                    rejected += 1
+
+        stop = asyncio.Event()
+        poller = asyncio.create_task(poll(client, faqs_url, stop))
+        start = time.perf_counter()
+        await asyncio.gather(*(login() for _ in range(logins)))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        latencies = await poller
+
+    latencies.sort()
+    return {
+        "logins/s": round(succeeded / elapsed, 2),
+        "rejected": rejected,
+        "failed": logins - succeeded - rejected,
+        "faqs p50 (ms)": round(statistics.median(latencies) * 1000, 2),
+        "faqs p95 (ms)": round(
+            latencies[int(len(latencies) * 0.95) - 1] * 1000, 2
+        ),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+    # Logins of the benchmark would otherwise mostly be answered with 429
+    env_setting.RATE_LIMIT_ENABLED = False
+
+    for label, workers in (
+        ("default executor", 0),
+        (f"hashing pool ({args.workers} workers)", args.workers),
+    ):
+        password_hasher.resize(workers)
+        print(label, asyncio.run(run(args.logins, args.concurrency)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Requests per second through pure-ASGI vs BaseHTTPMiddleware middlewares.
+
+The `base-http` variant puts a pass-through `BaseHTTPMiddleware` (what
+`@app.middleware("http")` registers) in front of each of the app's own
+middlewares, reproducing the task & memory-stream overhead they had before
+being rewritten as plain ASGI callables.
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+from api import app, v1_router
+from api.tests import base_url
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+
+asgi_middlewares = list(app.user_middleware)
+
+
+async def pass_through(request, call_next):
+    return await call_next(request)
+
+
+def use_base_http_middlewares(enabled: bool) -> None:
+    middlewares = []
+    for middleware in asgi_middlewares:
+        if enabled and middleware.cls.__module__.startswith("api."):
+            middlewares.append(
+                Middleware(BaseHTTPMiddleware, dispatch=pass_through)
+            )
+        middlewares.append(middleware)
+
+    app.user_middleware = middlewares
+    app.middleware_stack = None  # Rebuilt on next request
+
+
+async def run(url: str, requests: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url=base_url
+    ) as client:
+
+        async def fetch():
+            async with semaphore:
+                resp = await client.get(url)
+                resp.raise_for_status()
+
+        await fetch()  # Warm up
+        start = time.perf_counter()
+        await asyncio.gather(*(fetch() for _ in range(requests)))
+        return round(requests / (time.perf_counter() - start), 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    urls = {
+        "/health": "http://testserver/health",
+        "/api/v1/business/faqs": v1_router.url_path_for(
+            "Frequently asked questions"
+        ),
+    }
+    for label, base_http in (("base-http", True), ("asgi", False)):
+        use_base_http_middlewares(base_http)
+        for name, url in urls.items():
+            requests_per_second = asyncio.run(
+                run(url, args.requests, args.concurrency)
+            )
+            print(f"{label:<10} {name:<24} {requests_per_second} req/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Pages of 30 rows dumped per second by `DumpableModelMixin.model_dump`.
+
+`uncached` builds the dump plan of the model on every call, `cached`
+reuses it. Rows are built in memory so that only dumping is timed.
+"""
+
+import argparse
+import os
+import time
+from decimal import Decimal
+from unittest.mock import patch
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "project.settings")
+
+import django
+
+django.setup()
+
+from django.utils import timezone  # noqa: E402
+from external.models import FAQ  # noqa: E402
+from finance.models import Transaction  # noqa: E402
+from project.utils import models  # noqa: E402
+
+ROWS = 30
+
+
+def build_pages() -> dict[str, tuple[list, dict]]:
+    now = timezone.now()
+    return {
+        "faqs": (
+            [
+                FAQ(id=index, question="Why?", answer="Because", index=index)
+                for index in range(ROWS)
+            ],
+            {},
+        ),
+        "transactions (all=True)": (
+            [
+                Transaction(
+                    id=index,
+                    user_id=1,
+                    type="Deposit",
+                    amount=Decimal("1000.00"),
+                    reference="4U3JDRQN",
+                    created_at=now,
+                )
+                for index in range(ROWS)
+            ],
+            {"all": True, "exclude": ["user"]},
+        ),
+    }
+
+
+def run(rows: list, kwargs: dict, pages: int) -> float:
+    start = time.perf_counter()
+    for _ in range(pages):
+        [row.model_dump(**kwargs) for row in rows]
+    return round(pages / (time.perf_counter() - start), 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=2000)
+    args = parser.parse_args()
+
+    for name, (rows, kwargs) in build_pages().items():
+        with patch.object(
+            models, "get_dump_plan", models.get_dump_plan.__wrapped__
+        ):
+            uncached = run(rows, kwargs, args.pages)
+        cached = run(rows, kwargs, args.pages)
+        print(
+            f"{name:<24} uncached {uncached} pages/s, cached {cached} pages/s"
+            f" ({cached / uncached:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
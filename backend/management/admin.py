@@ -10,6 +10,7 @@ from management.models import (
     GroupMessage,
     MemberGroup,
     PersonalMessage,
+    SlowRequestReport,
 )
 
 # Register your models here.
@@ -200,3 +201,26 @@ class AppUtilityAdmin(DevelopmentImportExportModelAdmin):
         (_("Timestamps"), {"fields": ("updated_at", "created_at")}),
     )
     readonly_fields = ("updated_at", "created_at")
+
+
+@admin.register(SlowRequestReport)
+class SlowRequestReportAdmin(admin.ModelAdmin):
+    list_display = (
+        "created_at",
+        "method",
+        "path",
+        "route",
+        "status_code",
+        "duration_ms",
+        "threshold_ms",
+        "user_id",
+    )
+    search_fields = ("path", "route", "request_id")
+    list_filter = ("method", "route", "status_code", "created_at")
+    date_hierarchy = "created_at"
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
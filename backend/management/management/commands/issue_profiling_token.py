@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+from project.settings import env_setting
+from project.utils.profiling import issue_profiling_token
+from users.models import CustomUser
+
+
+class Command(BaseCommand):
+    help = (
+        "Issues a token for profiling requests. Send it in the "
+        "`X-Profile-Token` header along with `X-Profile: sample|cprofile`"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "username", help="Superuser on whose behalf the token is issued"
+        )
+
+    def handle(self, *args, **options):
+        if not CustomUser.objects.filter(
+            username=options["username"], is_superuser=True
+        ).exists():
+            raise CommandError(f"No superuser named {options['username']!r}")
+
+        if not env_setting.PROFILING_ENABLED:
+            self.stderr.write(
+                self.style.WARNING(
+                    "Profiling is disabled. Set PROFILING_ENABLED in .env"
+                )
+            )
+
+        self.stdout.write(issue_profiling_token(options["username"]))
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Valid for "
+                f"{env_setting.PROFILING_TOKEN_MAX_AGE} seconds. Reports are "
+                f"saved in {env_setting.PROFILING_DIR}"
+            )
+        )
@@ -246,3 +246,77 @@ class AppUtility(DumpableModelMixin):
     class Meta:
         verbose_name = _("App Utility")
         verbose_name_plural = _("App Utilities")
+
+
+class SlowRequestReport(models.Model):
+    """Request that took longer than its slow-request threshold.
+
+    Only the latest `SLOW_REQUEST_REPORTS_KEPT` are kept.
+    """
+
+    method = models.CharField(max_length=10, verbose_name=_("Method"))
+    path = models.CharField(max_length=255, verbose_name=_("Path"))
+    route = models.CharField(
+        max_length=255,
+        verbose_name=_("Route"),
+        help_text=_("Name of the route that served the request"),
+        null=True,
+        blank=True,
+    )
+    status_code = models.PositiveSmallIntegerField(verbose_name=_("Status"))
+    duration_ms = models.FloatField(
+        verbose_name=_("Duration (ms)"),
+        help_text=_("Time taken to serve the request"),
+    )
+    threshold_ms = models.FloatField(
+        verbose_name=_("Threshold (ms)"),
+        help_text=_("Slow-request threshold applying to the route"),
+    )
+    user_id = models.PositiveIntegerField(
+        verbose_name=_("User ID"), null=True, blank=True
+    )
+    request_id = models.CharField(
+        max_length=128, verbose_name=_("Request ID"), null=True, blank=True
+    )
+    params = models.JSONField(
+        verbose_name=_("Parameters"),
+        help_text=_("Path & query parameters"),
+        default=dict,
+    )
+    queries = models.JSONField(
+        verbose_name=_("Queries"),
+        help_text=_("SQL run & milliseconds each took"),
+        default=list,
+    )
+    stack_samples = models.TextField(
+        verbose_name=_("Stack samples"),
+        help_text=_(
+            "Stacks sampled while the request was slow, in folded format "
+            "(frames separated by ; followed by the number of samples)"
+        ),
+        blank=True,
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name=_("created at"),
+        help_text=_("Date and time when the entry was created"),
+    )
+
+    def __str__(self):
+        return f"{self.method} {self.path} - {self.duration_ms:.0f}ms"
+
+    @classmethod
+    def record(cls, keep: int, **report) -> "SlowRequestReport":
+        """Saves report and deletes those older than the latest `keep`"""
+        new_report = cls.objects.create(**report)
+        stale_ids = list(
+            cls.objects.order_by("-id").values_list("id", flat=True)[keep:]
+        )
+        if stale_ids:
+            cls.objects.filter(id__in=stale_ids).delete()
+        return new_report
+
+    class Meta:
+        verbose_name = _("Slow Request Report")
+        verbose_name_plural = _("Slow Request Reports")
+        ordering = ["-id"]
@@ -0,0 +1,41 @@
+"""Configs for API-only workers, used when `API_ONLY` is set.
+
+Such workers serve no django views, so apps & middlewares needed only by
+the admin & account views (mounted at `DJANGO_PREFIX`) are left out. Those
+views are left to workers running the full configs e.g
+`python manage.py runserver` or uwsgi.
+"""
+
+from . import *  # noqa: F403
+
+ADMIN_ONLY_APPS = {
+    "jazzmin",
+    "ckeditor",
+    "import_export",
+    "corsheaders",
+    "django.contrib.sessions",
+    "django.contrib.messages",
+    "django.contrib.staticfiles",
+}
+
+INSTALLED_APPS = [
+    # Admin's models are kept for their relations, its modules aren't loaded
+    (
+        "django.contrib.admin.apps.SimpleAdminConfig"
+        if app == "django.contrib.admin"
+        else app
+    )
+    for app in INSTALLED_APPS  # noqa: F405
+    if app not in ADMIN_ONLY_APPS
+]
+
+MIDDLEWARE = []
+
+SILENCED_SYSTEM_CHECKS = [
+    *SILENCED_SYSTEM_CHECKS,  # noqa: F405
+    # Requirements of admin views, which aren't served
+    "admin.E406",
+    "admin.E408",
+    "admin.E409",
+    "admin.E410",
+]
@@ -44,7 +44,12 @@ INSTALLED_APPS = [
     "management.apps.ManagementConfig",
     "external.apps.ExternalConfig",
     # Add your other apps here
-    "django.contrib.admin",
+    (
+        # Admin modules get registered when urls are first loaded
+        "django.contrib.admin.apps.SimpleAdminConfig"
+        if env_setting.LAZY_STARTUP
+        else "django.contrib.admin"
+    ),
     "django.contrib.auth",
     "django.contrib.contenttypes",
     "django.contrib.sessions",
@@ -107,6 +112,67 @@ DATABASES = {
     }
 }
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": env_setting.CACHE_BACKEND,
+        "LOCATION": env_setting.CACHE_LOCATION or "",
+    }
+}
+
+# Logging
+# https://docs.djangoproject.com/en/5.1/topics/logging/
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "filters": {
+        "request_id": {"()": "project.utils.log.RequestIdFilter"},
+    },
+    "formatters": {
+        "verbose": {
+            "format": "{asctime} {levelname} {name} [{request_id}] {message}",
+            "style": "{",
+        },
+        "message": {"format": "{message}", "style": "{"},
+    },
+    "handlers": {
+        "console": {"class": "logging.StreamHandler", "formatter": "verbose"},
+        "access": (
+            {
+                "class": "logging.handlers.WatchedFileHandler",
+                "filename": env_setting.ACCESS_LOG_FILE,
+                "formatter": "message",
+                # Opened once the API logs a request
+                "delay": True,
+            }
+            if env_setting.ACCESS_LOG_FILE
+            else {"class": "logging.StreamHandler", "formatter": "message"}
+        ),
+        # Hand records over to listener threads, started with the first
+        # record of each process
+        "queue": {
+            "class": "project.utils.log.QueueHandler",
+            "handlers": ["console"],
+            "filters": ["request_id"],
+        },
+        "access_queue": {
+            "class": "project.utils.log.QueueHandler",
+            "handlers": ["access"],
+        },
+    },
+    "loggers": {
+        "api": {"handlers": ["queue"], "level": env_setting.LOG_LEVEL},
+        "api.access": {
+            "handlers": ["access_queue"],
+            "level": "INFO" if env_setting.ACCESS_LOG else "WARNING",
+            "propagate": False,
+        },
+    },
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
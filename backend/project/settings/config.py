@@ -31,6 +31,8 @@ class EnvSettings(BaseModel):
     SITE_ADDRESS: Annotated[str, HttpUrl] = "http://localhost:8000"
     API_VERSION: str | None = "0.1.0"
     FRONTEND_DIR: str | None = None
+    LAZY_STARTUP: bool = False
+    API_ONLY: bool = False
 
     # E-MAIL
     EMAIL_BACKEND: str | None = "django.core.mail.backends.smtp.EmailBackend"
@@ -68,12 +70,82 @@ class EnvSettings(BaseModel):
     ]
     CORS_ALLOW_CREDENTIALS: bool | None = False
     CORS_ALLOW_HEADERS: list[str] = ["*"]
+    CORS_PREFLIGHT_MAX_AGE: int = 600
 
     # UTILS
     CURRENCY: str | None = "Ksh"
 
     DEMO: bool | None = False
 
+    # AUTH
+    AUTH_TOKEN_CACHE_SIZE: int = 1024
+    AUTH_TOKEN_CACHE_TTL: float = 5
+    AUTH_TOKEN_CACHE_ALIAS: str | None = None
+    AUTH_SIGNED_TOKENS: bool = True
+    AUTH_SIGNED_TOKEN_MAX_AGE: int | None = None
+    PASSWORD_HASHER_WORKERS: int = 2
+    PASSWORD_HASHER_MAX_PENDING: int = 32
+    AUTH_TOKEN_SWEEP_INTERVAL: float | None = 3600
+    USERNAME_INDEX_MODE: Literal["set", "bloom", "disabled"] = "set"
+    USERNAME_INDEX_REFRESH_INTERVAL: float = 300
+    USERNAME_INDEX_ERROR_RATE: float = 0.01
+    USERNAME_INDEX_CACHE_ALIAS: str | None = None
+
+    # CACHE
+    CACHE_BACKEND: str = "django.core.cache.backends.locmem.LocMemCache"
+    CACHE_LOCATION: str | None = None
+
+    # RATE LIMITING
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: Literal["memory", "cache"] = "memory"
+    RATE_LIMIT_CACHE_ALIAS: str = "default"
+    RATE_LIMIT_TOKEN: str = "10/minute"
+    RATE_LIMIT_TOKEN_IP: str = "30/minute"
+    RATE_LIMIT_USERNAME_CHECK: str = "60/minute"
+    RATE_LIMIT_PASSWORD_RESET: str = "5/hour"
+    RATE_LIMIT_PASSWORD_RESET_IP: str = "20/hour"
+
+    # RESPONSE CACHE
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_SIZE: int = 256
+    RESPONSE_CACHE_TTL: float = 60
+    RESPONSE_CACHE_CONTROL: str = "public, max-age=60"
+
+    # COMPRESSION
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 500
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_ZSTD_LEVEL: int = 3
+
+    # HTTP CLIENTS
+    HTTP_CLIENT_TIMEOUT: float = 10
+    HTTP_CLIENT_CONNECT_TIMEOUT: float = 5
+    HTTP_CLIENT_MAX_CONNECTIONS: int = 20
+    HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    HTTP_CLIENT_KEEPALIVE_EXPIRY: float = 30
+    HTTP_CLIENT_HTTP2: bool = False
+
+    # OBSERVABILITY
+    LOG_LEVEL: Literal["DEBUG", "INFO", "WARNING", "ERROR"] = "INFO"
+    ACCESS_LOG: bool = True
+    ACCESS_LOG_FILE: str | None = None
+    N_PLUS_ONE_THRESHOLD: int = 5
+    SLOW_REQUEST_THRESHOLD: float | None = 2
+    SLOW_REQUEST_SAMPLE_INTERVAL: float = 0.1
+    SLOW_REQUEST_REPORTS_KEPT: int = 100
+    METRICS_ENABLED: bool = False
+    METRICS_PATH: str = "/metrics"
+    METRICS_TOKEN: str | None = None
+    METRICS_DIR: str | None = None
+    METRICS_FLUSH_INTERVAL: float = 5
+    PROFILING_ENABLED: bool = False
+    PROFILING_DIR: str = "profiles"
+    PROFILING_TOKEN_MAX_AGE: int = 3600
+    PROFILING_SAMPLE_INTERVAL: float = 0.005
+    WARMUP_ENABLED: bool = True
+    HEALTH_DB_PING_TTL: float = 5
+
     # PROJECT
     REPOSITORY_LINK: str | None = (
         "https://github.com/Simatwa/django-fastapi-boilerplate"
@@ -104,7 +176,7 @@ class EnvSettings(BaseModel):
             values = [element.strip() for element in values]
         return values
 
-    @field_validator("API_PREFIX", "DJANGO_PREFIX")
+    @field_validator("API_PREFIX", "DJANGO_PREFIX", "METRICS_PATH")
     def validate_route_prefixes(value: str):
         if not value.startswith("/"):
             raise ValueError(
@@ -115,8 +187,17 @@ class EnvSettings(BaseModel):
 
         return value
 
+    @property
+    def django_settings_module(self) -> str:
+        """Configs the api runs django with"""
+        if self.API_ONLY:
+            return "project.settings.api"
+        return "project.settings.mounted"
+
     @property
     def cors_allowed_origins(self):
+        if self.CORS_ALLOW_ALL_ORIGINS:
+            return ["*"]
         return self.CORS_ALLOWED_ORIGINS or ["*"]
 
 
@@ -0,0 +1,15 @@
+"""Configs for django mounted in the API at `DJANGO_PREFIX`, used unless
+`API_ONLY` is set.
+
+The API's middleware handles CORS for the mounted views, so corsheaders'
+is left out. Django served on its own e.g `python manage.py runserver`
+keeps it.
+"""
+
+from . import *  # noqa: F403
+
+MIDDLEWARE = [
+    middleware
+    for middleware in MIDDLEWARE  # noqa: F405
+    if middleware != "corsheaders.middleware.CorsMiddleware"
+]
@@ -6,7 +6,8 @@ import httpx
 from django.db import models
 
 from project.settings import env_setting
-from project.utils.common import get_event_loop
+from project.utils.http_clients import http_clients
+from project.utils.telemetry import measure
 
 
 class CloudStorage:
@@ -16,11 +17,17 @@ class CloudStorage:
         "Authorization": f"Bearer {env_setting.CLOUDSTORAGE_TOKEN}",
     }
 
-    def __init__(self, base_url: str | None = None, **httpx_kwargs: dict):
+    def __init__(
+        self,
+        base_url: str | None = None,
+        name: str = "cloud_storage",
+        **httpx_kwargs: dict,
+    ):
         # Merge default headers into kwargs
         headers = httpx_kwargs.pop("headers", {})
         headers.update(self.httpx_defaults)
 
+        self.name = name
         base_url = base_url or env_setting.CLOUDSTORAGE_URL
         if base_url:
             assert env_setting.CLOUDSTORAGE_TOKEN, (
@@ -28,24 +35,17 @@ class CloudStorage:
                 "Add CLOUDSTORAGE_TOKEN to your .env file."
             )
             self._upload_file = True
-            self.client = httpx.AsyncClient(
-                base_url=str(base_url),
-                headers=headers,
-                **httpx_kwargs,
+            http_clients.register(
+                name, base_url=str(base_url), headers=headers, **httpx_kwargs
             )
         else:
             self._upload_file = False
-            self.client = None
 
-    async def upload(
-        self,
-        model_file: models.ImageField | models.FileField,
-        delete_local_file: bool = env_setting.DELETE_LOCALFILE,
-    ) -> str | None:
-        """
-        Uploads a Django model FileField or ImageField file to cloud storage.
-        Returns the accessible file URL (string).
-        """
+    @property
+    def client(self) -> httpx.AsyncClient | None:
+        return http_clients.get(self.name) if self._upload_file else None
+
+    def _upload_files(self, model_file) -> dict:
         if not self._upload_file:
             raise RuntimeError(
                 "CloudStorage is disabled (no CLOUDSTORAGE_URL set)."
@@ -57,12 +57,42 @@ class CloudStorage:
         file_name = getattr(model_file, "name", "uploaded_file")
         file_content = model_file.read()
 
-        files = {"file": (file_name, file_content)}
+        return {"file": (file_name, file_content)}
 
-        resp = await self.client.post(
-            "/storage/upload/",
-            files=files,
-        )
+    async def upload(
+        self,
+        model_file: models.ImageField | models.FileField,
+        delete_local_file: bool = env_setting.DELETE_LOCALFILE,
+    ) -> str | None:
+        """
+        Uploads a Django model FileField or ImageField file to cloud storage.
+        Returns the accessible file URL (string).
+        """
+        files = self._upload_files(model_file)
+        with measure("http"):
+            resp = await self.client.post(
+                "/storage/upload/",
+                files=files,
+            )
+        return self._file_url(resp, model_file, delete_local_file)
+
+    def upload_sync(
+        self,
+        model_file: models.ImageField | models.FileField,
+        delete_local_file: bool = env_setting.DELETE_LOCALFILE,
+    ) -> str | None:
+        """`upload` for sync code, which may run outside the event loop"""
+        files = self._upload_files(model_file)
+        with measure("http"):
+            resp = http_clients.get_sync(self.name).post(
+                "/storage/upload/",
+                files=files,
+            )
+        return self._file_url(resp, model_file, delete_local_file)
+
+    def _file_url(
+        self, resp: httpx.Response, model_file, delete_local_file: bool
+    ) -> str | None:
         resp.raise_for_status()
 
         # Expect API to return {"url": "..."}
@@ -81,9 +111,6 @@ class CloudStorage:
 
         return file_path
 
-    def upload_sync(self, *args, **kwargs) -> str | None:
-        return get_event_loop().run_until_complete(self.upload(*args, **kwargs))
-
     @classmethod
     def get_best_file_url(cls, local_file, cloud_url, default=None) -> None:
         return (
@@ -0,0 +1,185 @@
+"""Shared outbound http clients.
+
+Each service called by the project gets one client, holding a pool of
+keep-alive connections to its host, rather than a new connection (and TLS
+handshake) per request. The api opens them on startup and closes them on
+shutdown.
+"""
+
+import asyncio
+import logging
+from collections.abc import AsyncGenerator
+
+import httpx
+
+from project.settings import env_setting
+from project.utils.metrics import httpx_event_hooks, sync_httpx_event_hooks
+
+try:
+    import h2
+except ImportError:
+    h2 = None
+
+logger = logging.getLogger(__name__)
+
+
+def use_http2() -> bool:
+    if env_setting.HTTP_CLIENT_HTTP2 and h2 is None:
+        logger.warning(
+            "HTTP_CLIENT_HTTP2 is set but h2 isn't installed, using HTTP/1.1."
+            " Install it with `pip install httpx[http2]`"
+        )
+        return False
+    return env_setting.HTTP_CLIENT_HTTP2
+
+
+class HTTPClients:
+    """Registry of named clients, each talking to a single host. Their
+    connection limits therefore apply per host.
+
+    #### Usage
+
+    ```python
+    http_clients.register("payments", base_url="https://pay.example.com")
+
+    resp = await http_clients.get("payments").post("/charges", json=data)
+    ```
+    """
+
+    def __init__(self):
+        self._options: dict[str, dict] = {}
+        self._clients: dict[
+            str,
+            tuple[httpx.AsyncClient, asyncio.AbstractEventLoop, AsyncGenerator],
+        ] = {}
+        self._sync_clients: dict[str, httpx.Client] = {}
+        self._http2: bool | None = None
+
+    @property
+    def http2(self) -> bool:
+        """Whether clients use HTTP/2. Checked once, on first use"""
+        if self._http2 is None:
+            self._http2 = use_http2()
+        return self._http2
+
+    def register(self, name: str, **options) -> None:
+        """`options` are passed to the clients e.g `base_url` & `headers`"""
+        self._options[name] = options
+
+    def client_options(self, name: str) -> dict:
+        return {
+            "timeout": httpx.Timeout(
+                env_setting.HTTP_CLIENT_TIMEOUT,
+                connect=env_setting.HTTP_CLIENT_CONNECT_TIMEOUT,
+            ),
+            "http2": self.http2,
+            **self._options[name],
+            "limits": self.client_limits(name),
+        }
+
+    def client_limits(self, name: str) -> httpx.Limits:
+        return self._options[name].get("limits") or httpx.Limits(
+            max_connections=env_setting.HTTP_CLIENT_MAX_CONNECTIONS,
+            max_keepalive_connections=(
+                env_setting.HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS
+            ),
+            keepalive_expiry=env_setting.HTTP_CLIENT_KEEPALIVE_EXPIRY,
+        )
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        """Client for the running event loop. Its connections can't be
+        used by another one"""
+        loop = asyncio.get_running_loop()
+        client, client_loop, _ = self._clients.get(name, (None, None, None))
+        if client is None or client.is_closed or client_loop is not loop:
+            client = httpx.AsyncClient(
+                event_hooks=httpx_event_hooks, **self.client_options(name)
+            )
+            # Dropping the previous client's closer closes it on its loop
+            self._clients[name] = (client, loop, close_with_loop(client))
+        return client
+
+    def get_sync(self, name: str) -> httpx.Client:
+        """Client for use outside of event loops"""
+        client = self._sync_clients.get(name)
+        if client is None or client.is_closed:
+            client = httpx.Client(
+                event_hooks=sync_httpx_event_hooks,
+                **self.client_options(name),
+            )
+            self._sync_clients[name] = client
+        return client
+
+    def open(self) -> None:
+        """Creates the clients of the running event loop"""
+        for name in self._options:
+            self.get(name)
+
+    async def aclose(self) -> None:
+        clients, self._clients = self._clients, {}
+        for client, _, _ in clients.values():
+            await client.aclose()
+
+        sync_clients, self._sync_clients = self._sync_clients, {}
+        for client in sync_clients.values():
+            client.close()
+
+    def stats(self) -> dict[str, dict[str, int | None]]:
+        """Connections of each client's pool & its limit"""
+        clients = [
+            (name, name, client)
+            for name, (client, _, _) in self._clients.items()
+        ]
+        clients.extend(
+            (f"{name}-sync", name, client)
+            for name, client in self._sync_clients.items()
+        )
+        stats = {}
+        for key, name, client in clients:
+            connections = pool_connections(client)
+            if connections is None:
+                continue
+            active = sum(not conn.is_idle() for conn in connections)
+            stats[key] = {
+                "active": active,
+                "idle": len(connections) - active,
+                "limit": self.client_limits(name).max_connections,
+            }
+        return stats
+
+
+def pool_connections(client: httpx.Client | httpx.AsyncClient) -> list | None:
+    """Connections of the httpcore pool behind `client`, if reachable.
+
+    httpx keeps its transport & pool private, so they are looked up
+    defensively. Custom transports (e.g mocks) & httpx versions laying them
+    out differently yield None rather than failing metrics collection.
+    """
+    transport = getattr(client, "_transport", None)
+    pool = getattr(transport, "_pool", None)
+    connections = getattr(pool, "connections", None)
+    if not isinstance(connections, list) or not all(
+        callable(getattr(conn, "is_idle", None)) for conn in connections
+    ):
+        return None
+    return connections
+
+
+def close_with_loop(client: httpx.AsyncClient) -> AsyncGenerator:
+    """Closes `client` on the running loop once the returned generator is
+    dropped or the loop shuts async generators down, which `asyncio.run` &
+    uvicorn do before closing it"""
+
+    async def closer():
+        try:
+            yield
+        finally:
+            await client.aclose()
+
+    generator = closer()
+    # Started so that the loop finalizes it
+    asyncio.ensure_future(anext(generator))
+    return generator
+
+
+http_clients = HTTPClients()
@@ -0,0 +1,84 @@
+"""Logging helpers.
+
+Records of the `api` loggers go through queue handlers (see `LOGGING` in
+settings) so that formatting output & writing it happens on listener
+threads rather than the event loop.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+from contextvars import ContextVar
+
+request_id: ContextVar[str | None] = ContextVar("request_id", default=None)
+"""Id of the request being served"""
+
+QUEUE_HANDLERS = ("queue", "access_queue")
+
+
+class RequestIdFilter(logging.Filter):
+    """Adds `request_id` to records. Attached to the queue handlers so that
+    it runs within the request's context"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id.get() or "-"
+        return True
+
+
+class QueueHandler(logging.handlers.QueueHandler):
+    """Starts its listener with the first record of each process, so that
+    records get written without the API lifespan too & after forks"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.listener_pid: int | None = None
+        self._listener_lock = threading.Lock()
+
+    def start_listener(self) -> None:
+        listener = getattr(self, "listener", None)
+        if listener is None or self.listener_pid == os.getpid():
+            return
+        with self._listener_lock:
+            if self.listener_pid == os.getpid():
+                return
+            if self.listener_pid is not None:
+                # Forked, the parent's listener thread didn't survive. This
+                # process gets a listener & queue of its own, leaving the
+                # records queued by the parent to it
+                self.queue = queue.Queue()
+                self.listener = logging.handlers.QueueListener(
+                    self.queue,
+                    *listener.handlers,
+                    respect_handler_level=listener.respect_handler_level,
+                )
+            self.listener.start()
+            self.listener_pid = os.getpid()
+            atexit.register(self.stop_listener)
+
+    def stop_listener(self) -> None:
+        """Stops the listener once it has handled every queued record"""
+        with self._listener_lock:
+            if self.listener_pid == os.getpid():
+                self.listener.stop()
+                self.listener_pid = None
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        self.start_listener()
+        super().enqueue(record)
+
+
+def start_queue_listeners() -> None:
+    for name in QUEUE_HANDLERS:
+        handler = logging.getHandlerByName(name)
+        if isinstance(handler, QueueHandler):
+            handler.start_listener()
+
+
+def stop_queue_listeners() -> None:
+    for name in QUEUE_HANDLERS:
+        handler = logging.getHandlerByName(name)
+        if isinstance(handler, QueueHandler):
+            handler.stop_listener()
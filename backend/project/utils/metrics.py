@@ -0,0 +1,445 @@
+"""In-process metrics exposed in Prometheus text format.
+
+Each worker process records into its own `registry`. When a metrics
+directory is configured, workers periodically write a snapshot of their
+metrics to `<directory>/metrics-<pid>-<id>.json` and whoever serves the
+scrape merges every snapshot. Counters & histograms of exited workers are
+folded into `<directory>/retired.json` so totals don't go backwards, their
+gauges are dropped.
+"""
+
+import glob
+import json
+import math
+import os
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from contextlib import contextmanager
+
+import httpx
+
+try:
+    import fcntl
+except ImportError:
+    # Windows, where workers aren't forked
+    fcntl = None
+
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+    math.inf,
+)
+
+
+class Metric:
+    type: str
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: tuple) -> tuple[str, ...]:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {self.labelnames}, got {labels}"
+            )
+        return tuple(str(label) for label in labels)
+
+    def samples(self) -> list:
+        with self._lock:
+            return [[list(key), value] for key, value in self._values.items()]
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, *labels, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels, value: float) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, *args, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(*args)
+        if buckets[-1] != math.inf:
+            buckets = (*buckets, math.inf)
+        self.buckets = buckets
+
+    def observe(self, *labels, value: float) -> None:
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = {
+                    "buckets": [0] * len(self.buckets),
+                    "sum": 0.0,
+                    "count": 0,
+                }
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry["buckets"][index] += 1
+                    break
+            entry["sum"] += value
+            entry["count"] += 1
+
+    def samples(self) -> list:
+        with self._lock:
+            return [
+                [list(key), {**entry, "buckets": list(entry["buckets"])}]
+                for key, entry in self._values.items()
+            ]
+
+
+class MetricsRegistry:
+    retired_file = "retired.json"
+    """Counters & histograms of exited processes"""
+
+    def __init__(self):
+        self.metrics: dict[str, Metric] = {}
+        self.collectors: list[Callable[[], None]] = []
+        self._process: tuple[int, str] | None = None
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames=()) -> Counter:
+        return self.register(Counter(name, documentation, tuple(labelnames)))
+
+    def gauge(self, name: str, documentation: str, labelnames=()) -> Gauge:
+        return self.register(Gauge(name, documentation, tuple(labelnames)))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames=(),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self.register(
+            Histogram(name, documentation, tuple(labelnames), buckets=buckets)
+        )
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """`collector` is called before every snapshot, e.g. to set gauges
+        from other components' stats"""
+        self.collectors.append(collector)
+
+    def snapshot(self) -> dict:
+        for collector in self.collectors:
+            collector()
+        return {
+            metric.name: {
+                "type": metric.type,
+                "help": metric.documentation,
+                "labelnames": list(metric.labelnames),
+                "buckets": list(getattr(metric, "buckets", ())),
+                "samples": metric.samples(),
+            }
+            for metric in self.metrics.values()
+        }
+
+    @property
+    def snapshot_file(self) -> str:
+        """Unique to this process, even if its pid gets reused"""
+        if self._process is None or self._process[0] != os.getpid():
+            self._process = (os.getpid(), uuid.uuid4().hex[:8])
+        return "metrics-%d-%s.json" % self._process
+
+    def write_snapshot(self, directory: str) -> None:
+        """Saves this process' metrics for other processes to merge"""
+        path = os.path.join(directory, self.snapshot_file)
+        write_json(
+            path, {"written_at": time.time(), "metrics": self.snapshot()}
+        )
+
+    def collect(self, directory: str | None = None) -> dict:
+        """This process' metrics merged with snapshots found in `directory`.
+        Snapshots of exited processes get retired"""
+        if not directory:
+            return self.snapshot()
+
+        self.write_snapshot(directory)
+        snapshots, dead_pids = [], set()
+        for path, pid in list_snapshots(directory):
+            if not pid_is_alive(pid):
+                dead_pids.add(pid)
+                continue
+            snapshot = read_snapshot(path)
+            if snapshot is not None:
+                snapshots.append((snapshot, True))
+
+        if dead_pids:
+            self.retire(directory, *dead_pids)
+        retired = read_snapshot(os.path.join(directory, self.retired_file))
+        if retired is not None:
+            snapshots.append((retired, False))
+        return merge_snapshots(snapshots)
+
+    def retire(self, directory: str, *pids: int) -> None:
+        """Folds the counters & histograms of exited processes into the
+        retired snapshot and deletes their own"""
+        with directory_lock(directory):
+            paths = [
+                path for path, pid in list_snapshots(directory) if pid in pids
+            ]
+            if not paths:
+                return
+
+            retired_path = os.path.join(directory, self.retired_file)
+            snapshots = [
+                (snapshot, False)
+                for snapshot in map(read_snapshot, [retired_path, *paths])
+                if snapshot is not None
+            ]
+            write_json(retired_path, {"metrics": merge_snapshots(snapshots)})
+            for path in paths:
+                os.remove(path)
+
+    def clear_directory(self, directory: str) -> None:
+        """Deletes snapshots of a previous run"""
+        with directory_lock(directory):
+            for path in glob.glob(os.path.join(directory, "*.json*")):
+                os.remove(path)
+
+
+def write_json(path: str, content: dict) -> None:
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "w") as file:
+        json.dump(content, file)
+    os.replace(temporary_path, path)
+
+
+def read_snapshot(path: str) -> dict | None:
+    try:
+        with open(path) as file:
+            return json.load(file)["metrics"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def list_snapshots(directory: str) -> list[tuple[str, int]]:
+    """Paths of processes' snapshots along with their pids"""
+    snapshots = []
+    for path in glob.glob(os.path.join(directory, "metrics-*-*.json")):
+        try:
+            pid = int(os.path.basename(path).split("-")[1])
+        except ValueError:
+            continue
+        snapshots.append((path, pid))
+    return snapshots
+
+
+@contextmanager
+def directory_lock(directory: str):
+    """Exclusive lock on `directory` across processes"""
+    with open(os.path.join(directory, ".lock"), "a") as file:
+        if fcntl is not None:
+            fcntl.flock(file, fcntl.LOCK_EX)
+        yield
+
+
+def pid_is_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def merge_snapshots(snapshots: list[tuple[dict, bool]]) -> dict:
+    """Sums samples sharing labels. Gauges only from living processes"""
+    merged: dict = {}
+    for snapshot, is_alive in snapshots:
+        for name, metric in snapshot.items():
+            target = merged.setdefault(name, {**metric, "samples": {}})
+            if metric["type"] == "gauge" and not is_alive:
+                continue
+            for labels, value in metric["samples"]:
+                key = tuple(labels)
+                current = target["samples"].get(key)
+                if current is None:
+                    target["samples"][key] = value
+                elif metric["type"] == "histogram":
+                    target["samples"][key] = {
+                        "buckets": [
+                            current_count + count
+                            for current_count, count in zip(
+                                current["buckets"], value["buckets"]
+                            )
+                        ],
+                        "sum": current["sum"] + value["sum"],
+                        "count": current["count"] + value["count"],
+                    }
+                else:
+                    target["samples"][key] = current + value
+
+    for metric in merged.values():
+        metric["samples"] = [
+            [list(key), value] for key, value in metric["samples"].items()
+        ]
+    return merged
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names, values) -> str:
+    if not names:
+        return ""
+    return (
+        "{"
+        + ",".join(
+            f'{name}="{_escape(str(value))}"'
+            for name, value in zip(names, values)
+        )
+        + "}"
+    )
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_prometheus(metrics: dict) -> str:
+    """Prometheus text exposition format (0.0.4) of a snapshot"""
+    lines = []
+    for name, metric in sorted(metrics.items()):
+        lines.append(f"# HELP {name} {_escape(metric['help'])}")
+        lines.append(f"# TYPE {name} {metric['type']}")
+        labelnames = metric["labelnames"]
+        for labels, value in metric["samples"]:
+            if metric["type"] != "histogram":
+                lines.append(
+                    f"{name}{_labels(labelnames, labels)} {_number(value)}"
+                )
+                continue
+
+            cumulative = 0
+            for bound, count in zip(metric["buckets"], value["buckets"]):
+                cumulative += count
+                bucket_labels = _labels(
+                    [*labelnames, "le"], [*labels, _number(bound)]
+                )
+                lines.append(f"{name}_bucket{bucket_labels} {cumulative}")
+            sample_labels = _labels(labelnames, labels)
+            lines.append(f"{name}_sum{sample_labels} {_number(value['sum'])}")
+            lines.append(f"{name}_count{sample_labels} {value['count']}")
+    return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_requests = registry.counter(
+    "http_requests_total",
+    "Requests served",
+    ("method", "route", "status"),
+)
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "Time taken to serve requests",
+    ("method", "route"),
+)
+http_requests_in_progress = registry.gauge(
+    "http_requests_in_progress",
+    "Requests being served",
+    ("method",),
+)
+db_queries = registry.counter(
+    "db_queries_total",
+    "Database queries run while serving requests",
+    ("method", "route"),
+)
+db_query_duration = registry.counter(
+    "db_query_duration_seconds_total",
+    "Time spent on database queries while serving requests",
+    ("method", "route"),
+)
+http_client_request_duration = registry.histogram(
+    "http_client_request_duration_seconds",
+    "Time taken by outbound http requests until response headers",
+    ("method", "host", "status"),
+)
+
+
+def _mark_request_start(request: httpx.Request) -> None:
+    request.extensions["metrics_started_at"] = time.perf_counter()
+
+
+def _observe_response(response: httpx.Response) -> None:
+    request = response.request
+    started_at = request.extensions.get("metrics_started_at")
+    if started_at is not None:
+        http_client_request_duration.observe(
+            request.method,
+            request.url.host,
+            response.status_code,
+            value=time.perf_counter() - started_at,
+        )
+
+
+async def _amark_request_start(request: httpx.Request) -> None:
+    _mark_request_start(request)
+
+
+async def _aobserve_response(response: httpx.Response) -> None:
+    _observe_response(response)
+
+
+httpx_event_hooks = {
+    "request": [_amark_request_start],
+    "response": [_aobserve_response],
+}
+"""Event hooks timing requests of an `httpx.AsyncClient`"""
+
+sync_httpx_event_hooks = {
+    "request": [_mark_request_start],
+    "response": [_observe_response],
+}
+"""Event hooks timing requests of an `httpx.Client`"""
@@ -1,9 +1,13 @@
 import os
 import warnings
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import lru_cache
 from io import BytesIO
 from pathlib import Path
 from typing import Literal
 
+from asgiref.sync import sync_to_async
 from django.core.files.base import ContentFile
 from django.db import models
 from django.db.models import FileField, ImageField
@@ -226,7 +230,8 @@ def convert_to_webp(image_field: ImageField, quality: int = 85):
 
 class DumpableModelMixin(models.Model):
     """
-    Adds `.model_dump(relations=None, all=False, exclude=None)`.
+    Adds `.model_dump(relations=None, all=False, exclude=None)`. Use
+    `model_dump_many` & `amodel_dump_many` for querysets.
 
     - relations: list of Django-style paths ("author", "author__awards").
     - exclude: list of paths to skip.
@@ -251,160 +256,321 @@ class DumpableModelMixin(models.Model):
         _visited: set[tuple[str, any]] | None = None,
         _is_root: bool = True,
     ) -> dict[str, any]:
-        relations = relations or []
-        exclude = exclude or []
-
-        rel_map = _build_rel_map(relations)
-        exclude_map = _build_rel_map(exclude)
+        plan = get_dump_plan(
+            type(self), tuple(relations or ()), tuple(exclude or ()), all
+        )
 
         if _visited is None:
             _visited = set()
 
-        model_key = (
-            self._meta.label,
-            getattr(self, self._meta.pk.attname, None),
-        )
+        model_key = (plan.label, getattr(self, plan.pk_attname, None))
         if model_key in _visited and not _is_root:
-            return {self._meta.pk.name: getattr(self, self._meta.pk.attname)}
+            return {plan.pk_name: getattr(self, plan.pk_attname)}
 
         _visited.add(model_key)
-        payload: dict[str, any] = {}
+        payload = {name: dump(self, _visited) for name, dump in plan.steps}
+
+        if _is_root:
+            _visited.clear()
+        return payload
 
-        for field in self._meta.get_fields():
-            name = field.name
-            is_relation = field.is_relation
 
-            if name in exclude_map and not exclude_map[name]:
-                continue
+Dumper = Callable[[models.Model, set], any]
+
+
+@dataclass(frozen=True)
+class ExpandedRelation:
+    name: str
+    model: type[models.Model] | None
+    single: bool
+    """Whether it's a foreign key or one-to-one relation"""
+    nested: tuple[list[RelationPath], list[RelationPath], bool]
+    """Relations, exclude & all of the related objects' dumps"""
+
+
+@dataclass(frozen=True)
+class DumpPlan:
+    """How `model_dump` dumps a model for given relations, exclude & all"""
+
+    label: str
+    pk_name: str
+    pk_attname: str
+    steps: tuple[tuple[str, Dumper], ...]
+    """Key and dumper of each field dumped, in order"""
+    relations: tuple[ExpandedRelation, ...] = ()
+
+
+@lru_cache(maxsize=1024)
+def get_dump_plan(
+    model: type[models.Model],
+    relations: tuple[RelationPath, ...],
+    exclude: tuple[RelationPath, ...],
+    all: bool,
+) -> DumpPlan:
+    """Decides once per model and arguments which fields `model_dump`
+    dumps and how"""
+    rel_map = _build_rel_map(relations)
+    exclude_map = _build_rel_map(exclude)
+    steps = []
+    expanded_relations = []
+
+    for field in model._meta.get_fields():
+        name = field.name
+
+        if name in exclude_map and not exclude_map[name]:
+            continue
+
+        nested_rel = rel_map.get(name, {})
+        nested = (
+            _flatten_rel_map(nested_rel),
+            _flatten_rel_map(exclude_map.get(name, {})),
+            all,
+        )
 
-            nested_exclude = exclude_map.get(name, {})
-            nested_rel = rel_map.get(name, {})
-
-            expand = False
-            if name in nested_rel:
-                expand = True
-            elif all and is_relation and name not in exclude_map:
-                expand = True
-
-            if getattr(field, "concrete", False):
-                if isinstance(field, (ForeignKey, OneToOneField)):
-                    if field.name in exclude or all is False:
-                        continue
-
-                    related_obj = getattr(self, name, None)
-                    if related_obj is None:
-                        payload[name] = None
-                    elif expand:
-                        if hasattr(related_obj, "model_dump"):
-                            payload[name] = related_obj.model_dump(
-                                relations=_flatten_rel_map(nested_rel),
-                                exclude=_flatten_rel_map(nested_exclude),
-                                all=all,
-                                _visited=_visited,
-                                _is_root=False,
-                            )
-                        else:
-                            warnings.warn(
-                                f"{related_obj.__class__.__name__} has no model_dump; "  # noqa: E501
-                                "returning only {field.attname}"
-                            )
-                            payload[name] = getattr(self, field.attname)
-                    else:
-                        payload[name] = getattr(self, field.attname)
-
-                elif isinstance(field, (models.FileField, models.ImageField)):
-                    file_obj = getattr(self, name, None)
-                    payload[name] = (
-                        file_obj.url
-                        if (file_obj and getattr(file_obj, "url", None))
-                        else None
-                    )
-
-                elif isinstance(field, models.JSONField):
-                    value = getattr(self, name, None)
-                    if value is None:
-                        payload[name] = None
-                    elif isinstance(value, (dict, list, str, int, float, bool)):
-                        payload[name] = value
-                    else:
-                        payload[name] = str(value)
-
-                elif isinstance(
-                    field,
-                    (models.DateTimeField, models.DateField, models.TimeField),
-                ):
-                    value = getattr(self, name, None)
-                    payload[name] = value.isoformat() if value else None
-
-                elif isinstance(field, models.DecimalField):
-                    value = getattr(self, field.attname)
-                    payload[name] = str(value) if value is not None else None
-
-                else:
-                    payload[name] = getattr(self, field.attname)
+        expand = False
+        if name in rel_map:
+            expand = True
+        elif all and field.is_relation and name not in exclude_map:
+            expand = True
+
+        # Reverse relations without a related_name aren't reachable by it
+        if expand and field.is_relation and hasattr(model, name):
+            expanded_relations.append(
+                ExpandedRelation(
+                    name=name,
+                    model=field.related_model,
+                    single=field.many_to_one or field.one_to_one,
+                    nested=nested,
+                )
+            )
 
-            else:
-                if not expand:
+        if getattr(field, "concrete", False):
+            if isinstance(field, (ForeignKey, OneToOneField)):
+                if field.name in exclude or not (all or expand):
                     continue
+                dump = (
+                    _dump_related(name, field.attname, nested)
+                    if expand
+                    else _dump_value(field.attname)
+                )
 
-                try:
-                    attr = getattr(self, name)
-                except Exception:
-                    payload[name] = None
-                    continue
+            elif isinstance(field, (models.FileField, models.ImageField)):
+                dump = _dump_file(name)
 
-                if hasattr(attr, "all"):
-                    qs = attr.all()
-                    payload[name] = []
-                    for obj in qs:
-                        if hasattr(obj, "model_dump"):
-                            payload[name].append(
-                                obj.model_dump(
-                                    relations=_flatten_rel_map(nested_rel),
-                                    exclude=_flatten_rel_map(nested_exclude),
-                                    all=all,
-                                    _visited=_visited,
-                                    _is_root=False,
-                                )
-                            )
-                        else:
-                            warnings.warn(
-                                f"{obj.__class__.__name__} has no model_dump; "
-                                "returning only pk"
-                            )
-                            payload[name].append(
-                                {
-                                    obj._meta.pk.name: getattr(
-                                        obj, obj._meta.pk.attname
-                                    )
-                                }
-                            )
-                else:
-                    related_obj = attr
-                    if related_obj is None:
-                        payload[name] = None
-                    elif hasattr(related_obj, "model_dump"):
-                        payload[name] = related_obj.model_dump(
-                            relations=_flatten_rel_map(nested_rel),
-                            exclude=_flatten_rel_map(nested_exclude),
-                            all=all,
-                            _visited=_visited,
-                            _is_root=False,
-                        )
-                    else:
-                        warnings.warn(
-                            f"{related_obj.__class__.__name__} has no model"
-                            " dump; returning only pk"
-                        )
-                        payload[name] = {
-                            related_obj._meta.pk.name: getattr(
-                                related_obj, related_obj._meta.pk.attname
-                            )
-                        }
+            elif isinstance(field, models.JSONField):
+                dump = _dump_json(name)
 
-        if _is_root:
-            _visited.clear()
-        return payload
+            elif isinstance(
+                field,
+                (models.DateTimeField, models.DateField, models.TimeField),
+            ):
+                dump = _dump_temporal(name)
+
+            elif isinstance(field, models.DecimalField):
+                dump = _dump_decimal(field.attname)
+
+            else:
+                dump = _dump_value(field.attname)
+
+        elif expand:
+            dump = _dump_reverse_related(name, nested)
+
+        else:
+            continue
+
+        steps.append((name, dump))
+
+    return DumpPlan(
+        label=model._meta.label,
+        pk_name=model._meta.pk.name,
+        pk_attname=model._meta.pk.attname,
+        steps=tuple(steps),
+        relations=tuple(expanded_relations),
+    )
+
+
+@lru_cache(maxsize=256)
+def get_fetch_plan(
+    model: type[models.Model],
+    relations: tuple[RelationPath, ...],
+    exclude: tuple[RelationPath, ...],
+    all: bool,
+) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    """`select_related` & `prefetch_related` lookups fetching the relations
+    `model_dump` expands. Relations back to a model already on the path
+    are fetched but not followed further"""
+    select_related, prefetch_related = [], []
+
+    def plan(model, args, prefix, joinable, path_models):
+        for relation in get_dump_plan(model, *args).relations:
+            if relation.model is None:
+                # e.g generic foreign keys
+                continue
+
+            lookup = prefix + relation.name
+            if joinable and relation.single:
+                select_related.append(lookup)
+            else:
+                prefetch_related.append(lookup)
+
+            if relation.model not in path_models and issubclass(
+                relation.model, DumpableModelMixin
+            ):
+                nested_relations, nested_exclude, nested_all = relation.nested
+                plan(
+                    relation.model,
+                    (
+                        tuple(nested_relations),
+                        tuple(nested_exclude),
+                        nested_all,
+                    ),
+                    lookup + "__",
+                    joinable and relation.single,
+                    path_models | {relation.model},
+                )
+
+    plan(model, (relations, exclude, all), "", True, frozenset([model]))
+    return tuple(select_related), tuple(prefetch_related)
+
+
+def model_dump_many(
+    queryset: models.QuerySet,
+    relations: list[RelationPath] | None = None,
+    all: bool = False,
+    exclude: list[RelationPath] | None = None,
+) -> list[dict[str, any]]:
+    """`model_dump` of every object in `queryset`. Relations dumped are
+    fetched along with the objects instead of a few queries per object"""
+    relations, exclude = list(relations or ()), list(exclude or ())
+    select_related, prefetch_related = get_fetch_plan(
+        queryset.model, tuple(relations), tuple(exclude), all
+    )
+    if select_related:
+        queryset = queryset.select_related(*select_related)
+    if prefetch_related:
+        queryset = queryset.prefetch_related(*prefetch_related)
+
+    return [
+        obj.model_dump(relations=relations, all=all, exclude=exclude)
+        for obj in queryset
+    ]
+
+
+async def amodel_dump_many(
+    queryset: models.QuerySet,
+    relations: list[RelationPath] | None = None,
+    all: bool = False,
+    exclude: list[RelationPath] | None = None,
+) -> list[dict[str, any]]:
+    """Async `model_dump_many`. Runs in a thread as relations left out of
+    the fetch plan are loaded lazily"""
+    return await sync_to_async(model_dump_many)(
+        queryset, relations=relations, all=all, exclude=exclude
+    )
+
+
+def _dump_value(attname: str) -> Dumper:
+    def dump(obj, visited):
+        return getattr(obj, attname)
+
+    return dump
+
+
+def _dump_file(name: str) -> Dumper:
+    def dump(obj, visited):
+        file_obj = getattr(obj, name, None)
+        return (
+            file_obj.url
+            if (file_obj and getattr(file_obj, "url", None))
+            else None
+        )
+
+    return dump
+
+
+def _dump_json(name: str) -> Dumper:
+    def dump(obj, visited):
+        value = getattr(obj, name, None)
+        if value is None or isinstance(
+            value, (dict, list, str, int, float, bool)
+        ):
+            return value
+        return str(value)
+
+    return dump
+
+
+def _dump_temporal(name: str) -> Dumper:
+    def dump(obj, visited):
+        value = getattr(obj, name, None)
+        return value.isoformat() if value else None
+
+    return dump
+
+
+def _dump_decimal(attname: str) -> Dumper:
+    def dump(obj, visited):
+        value = getattr(obj, attname)
+        return str(value) if value is not None else None
+
+    return dump
+
+
+def _dump_nested(obj, nested: tuple, visited: set) -> dict:
+    relations, exclude, all = nested
+    return obj.model_dump(
+        relations=relations,
+        exclude=exclude,
+        all=all,
+        _visited=visited,
+        _is_root=False,
+    )
+
+
+def _dump_related(name: str, attname: str, nested: tuple) -> Dumper:
+    def dump(obj, visited):
+        related_obj = getattr(obj, name, None)
+        if related_obj is None:
+            return None
+        if hasattr(related_obj, "model_dump"):
+            return _dump_nested(related_obj, nested, visited)
+
+        warnings.warn(
+            f"{related_obj.__class__.__name__} has no model_dump; "
+            "returning only {field.attname}"
+        )
+        return getattr(obj, attname)
+
+    return dump
+
+
+def _dump_reverse_related(name: str, nested: tuple) -> Dumper:
+    def dump(obj, visited):
+        try:
+            attr = getattr(obj, name)
+        except Exception:
+            return None
+
+        if hasattr(attr, "all"):
+            return [
+                _dump_pk_or_nested(item, nested, visited) for item in attr.all()
+            ]
+
+        if attr is None:
+            return None
+        return _dump_pk_or_nested(attr, nested, visited)
+
+    return dump
+
+
+def _dump_pk_or_nested(obj, nested: tuple, visited: set) -> dict:
+    if hasattr(obj, "model_dump"):
+        return _dump_nested(obj, nested, visited)
+
+    warnings.warn(
+        f"{obj.__class__.__name__} has no model_dump; returning only pk"
+    )
+    return {obj._meta.pk.name: getattr(obj, obj._meta.pk.attname)}
 
 
 def _build_rel_map(paths: list[str]) -> dict[str, any]:
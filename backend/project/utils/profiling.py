@@ -0,0 +1,133 @@
+"""On-demand profiling of single requests.
+
+A request is profiled when it carries a profiling token, which admins issue
+using `python manage.py issue_profiling_token`. Reports are written to
+`PROFILING_DIR` as:
+
+- `<id>.folded` - sampled stacks in folded format, ready for flamegraph.pl
+  or speedscope.
+- `<id>.prof` - cProfile stats, ready for snakeviz, flameprof or pstats.
+"""
+
+import cProfile
+import os
+import sys
+import threading
+from collections import Counter
+
+from django.core import signing
+
+from project.settings import env_setting
+
+profiling_token_salt = "project.utils.profiling.token"
+
+
+def issue_profiling_token(issued_by: str) -> str:
+    return signing.dumps({"issued_by": issued_by}, salt=profiling_token_salt)
+
+
+def read_profiling_token(token: str) -> str | None:
+    """Name of whoever issued `token` if it is valid and not expired"""
+    try:
+        return signing.loads(
+            token,
+            salt=profiling_token_salt,
+            max_age=env_setting.PROFILING_TOKEN_MAX_AGE,
+        )["issued_by"]
+    except (signing.BadSignature, KeyError, TypeError):
+        return None
+
+
+class SamplingProfiler:
+    """Samples stacks of every thread each `interval` seconds.
+
+    Low overhead and sees code run by other threads too, such as sync views
+    & ORM calls made through `sync_to_async`.
+    """
+
+    extension = "folded"
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._sample, name="sampling-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _sample(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stopped.wait(self.interval):
+            thread_names = {
+                thread.ident: thread.name for thread in threading.enumerate()
+            }
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(
+                        f"{code.co_name} "
+                        f"({code.co_filename}:{frame.f_lineno})".replace(
+                            ";", ":"
+                        )
+                    )
+                    frame = frame.f_back
+                stack.append(thread_names.get(thread_id, str(thread_id)))
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def write(self, path: str) -> None:
+        with open(path, "w") as file:
+            for stack, count in self.stacks.most_common():
+                file.write(f"{stack} {count}\n")
+
+
+class CProfileProfiler:
+    """Deterministic profile of code run on the event loop's thread.
+
+    Other requests served concurrently by the same worker are included.
+    """
+
+    extension = "prof"
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+
+    def start(self) -> None:
+        self.profile.enable()
+
+    def stop(self) -> None:
+        self.profile.disable()
+
+    def write(self, path: str) -> None:
+        self.profile.dump_stats(path)
+
+
+Profiler = SamplingProfiler | CProfileProfiler
+
+
+def get_profiler(kind: str) -> Profiler | None:
+    if kind == "sample":
+        return SamplingProfiler(env_setting.PROFILING_SAMPLE_INTERVAL)
+    if kind == "cprofile":
+        return CProfileProfiler()
+    return None
+
+
+def write_report(profiler: Profiler, profile_id: str) -> str:
+    os.makedirs(env_setting.PROFILING_DIR, exist_ok=True)
+    path = os.path.join(
+        env_setting.PROFILING_DIR, f"{profile_id}.{profiler.extension}"
+    )
+    profiler.write(path)
+    return path
@@ -0,0 +1,140 @@
+"""Measures what starting the api package costs, in a fresh interpreter"""
+
+import json
+import subprocess
+import sys
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+STARTUP_SCRIPT = """
+import json, os, sys, time
+
+from project.settings.config import env_setting
+
+os.environ.setdefault(
+    "DJANGO_SETTINGS_MODULE", env_setting.django_settings_module
+)
+phases = {}
+print("phase: django.setup", file=sys.stderr, flush=True)
+started = time.perf_counter()
+
+import django
+
+django.setup()
+phases["django.setup"] = time.perf_counter() - started
+
+print("phase: import api", file=sys.stderr, flush=True)
+started = time.perf_counter()
+import api
+
+phases["import api"] = time.perf_counter() - started
+
+if not env_setting.API_ONLY:
+    print("phase: django urls (first request)", file=sys.stderr, flush=True)
+    started = time.perf_counter()
+    from django.urls import get_resolver
+
+    get_resolver().url_patterns
+    phases["django urls (first request)"] = time.perf_counter() - started
+
+print(json.dumps(phases))
+"""
+"""Times the phases of starting the api. Its imports are traced by
+`-X importtime`, phases are marked in between"""
+
+
+@dataclass(frozen=True)
+class ImportRecord:
+    module: str
+    self_us: int
+    cumulative_us: int
+    phase: str = ""
+    """Phase the module was imported in"""
+
+    @property
+    def package(self) -> str:
+        return self.module.split(".", 1)[0]
+
+
+@dataclass
+class StartupReport:
+    phases: dict[str, float]
+    imports: list[ImportRecord] = field(default_factory=list)
+
+    @property
+    def total(self) -> float:
+        return sum(self.phases.values())
+
+    def packages(self) -> Counter[str]:
+        """Microseconds spent importing each top-level package"""
+        spent = Counter()
+        for record in self.imports:
+            spent[record.package] += record.self_us
+        return spent
+
+    def format(self, top: int = 15) -> str:
+        lines = ["Phases"]
+        for phase, seconds in self.phases.items():
+            lines.append(f"  {phase:<32} {seconds * 1000:>9.1f} ms")
+        lines.append(f"  {'total':<32} {self.total * 1000:>9.1f} ms")
+
+        lines.extend(["", "Packages (own import time)"])
+        for package, spent in self.packages().most_common(top):
+            lines.append(f"  {package:<32} {spent / 1000:>9.1f} ms")
+
+        lines.extend(["", "Modules (including their imports)"])
+        slowest = sorted(self.imports, key=lambda record: record.cumulative_us)[
+            ::-1
+        ]
+        for record in slowest[:top]:
+            lines.append(
+                f"  {record.module:<48} {record.cumulative_us / 1000:>9.1f} ms"
+                f"  {record.phase}".rstrip()
+            )
+        return "\n".join(lines)
+
+
+def parse_importtime(output: str) -> list[ImportRecord]:
+    """Records of `-X importtime` lines in `output`"""
+    records = []
+    phase = ""
+    for line in output.splitlines():
+        if line.startswith("phase: "):
+            phase = line[7:]
+            continue
+        if not line.startswith("import time:"):
+            continue
+        try:
+            self_us, cumulative_us, module = line[12:].split("|")
+            records.append(
+                ImportRecord(
+                    module=module.strip(),
+                    self_us=int(self_us),
+                    cumulative_us=int(cumulative_us),
+                    phase=phase,
+                )
+            )
+        except ValueError:
+            # Header
+            continue
+    return records
+
+
+def measure_startup() -> StartupReport:
+    """Starts the api in a new interpreter, which has nothing imported"""
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", STARTUP_SCRIPT],
+        cwd=BASE_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if process.returncode != 0:
+        raise RuntimeError(f"Starting the api failed:\n{process.stderr}")
+
+    return StartupReport(
+        phases=json.loads(process.stdout.splitlines()[-1]),
+        imports=parse_importtime(process.stderr),
+    )
@@ -0,0 +1,160 @@
+"""Per-request timing of phases such as auth, db queries & outbound http.
+Also counts the request's queries by shape to spot N+1 patterns.
+
+The middleware serving a request sets `request_telemetry`. Code anywhere down
+the stack (including sync ORM code run through `sync_to_async`, which copies
+the context) records into it using `measure(...)`. Outside a request nothing
+is recorded.
+"""
+
+import re
+import threading
+import time
+from collections import Counter, deque
+from collections.abc import Callable
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+
+@dataclass
+class RequestTelemetry:
+    started_ns: int = field(default_factory=time.perf_counter_ns)
+    finished_ns: int | None = None
+    endpoint_finished_ns: int | None = None
+    phases: dict[str, int] = field(default_factory=dict)
+    """Phase name → total nanoseconds spent"""
+    user_id: int | None = None
+    """Id of the authenticated user, if any"""
+    query_count: int = 0
+    query_shapes: Counter[str] = field(default_factory=Counter)
+    queries: deque[tuple[str, int]] | None = None
+    """(sql, nanoseconds) of the latest queries, as many as the deque keeps.
+    Only recorded when set"""
+    sync_thread_id: int | None = None
+    """Thread that last ran (sync) queries for the request"""
+
+    def add(self, phase: str, duration_ns: int) -> None:
+        self.phases[phase] = self.phases.get(phase, 0) + duration_ns
+
+    def add_query(self, sql: str, duration_ns: int) -> None:
+        self.query_count += 1
+        self.query_shapes[query_shape(sql)] += 1
+        self.add("db", duration_ns)
+        if self.queries is not None:
+            self.queries.append((sql, duration_ns))
+
+    def repeated_queries(self, threshold: int) -> dict[str, int]:
+        """Query shapes run at least `threshold` times - likely N+1"""
+        return {
+            shape: count
+            for shape, count in self.query_shapes.items()
+            if count >= threshold
+        }
+
+    def finish(self) -> None:
+        self.finished_ns = time.perf_counter_ns()
+
+    @property
+    def duration_ns(self) -> int:
+        return (self.finished_ns or time.perf_counter_ns()) - self.started_ns
+
+    def phases_ms(self) -> dict[str, float]:
+        return {
+            phase: round(duration_ns / 1e6, 3)
+            for phase, duration_ns in self.phases.items()
+        }
+
+    def server_timing(self) -> str:
+        """Value for the `Server-Timing` response header"""
+        metrics = [
+            f"{phase};dur={duration_ms}"
+            for phase, duration_ms in self.phases_ms().items()
+        ]
+        metrics.append(f"total;dur={round(self.duration_ns / 1e6, 3)}")
+        return ", ".join(metrics)
+
+
+IN_LIST_PATTERN = re.compile(r"\(\s*%s(?:\s*,\s*%s)*\s*\)")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def query_shape(sql: str) -> str:
+    """SQL with variable-length `IN (%s, %s, ...)` lists collapsed"""
+    return IN_LIST_PATTERN.sub("(%s, ...)", WHITESPACE_PATTERN.sub(" ", sql))
+
+
+request_telemetry: ContextVar[RequestTelemetry | None] = ContextVar(
+    "request_telemetry", default=None
+)
+
+
+_observers: list[Callable[[RequestTelemetry], None]] = []
+
+
+def notify_observers(telemetry: RequestTelemetry) -> None:
+    """Called by the middleware once a request is finished"""
+    for observer in _observers:
+        observer(telemetry)
+
+
+@contextmanager
+def observe_requests():
+    """Collects telemetry of the requests finished within the block"""
+    finished: list[RequestTelemetry] = []
+    observer = finished.append
+    _observers.append(observer)
+    try:
+        yield finished
+    finally:
+        _observers.remove(observer)
+
+
+@contextmanager
+def measure(phase: str):
+    """Adds time spent in the block to `phase` of the current request"""
+    telemetry = request_telemetry.get()
+    if telemetry is None:
+        yield
+        return
+
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        telemetry.add(phase, time.perf_counter_ns() - start)
+
+
+def time_query(execute, sql, params, many, context):
+    """Django execute-wrapper timing queries of the current request"""
+    telemetry = request_telemetry.get()
+    if telemetry is None:
+        return execute(sql, params, many, context)
+
+    telemetry.sync_thread_id = threading.get_ident()
+    start = time.perf_counter_ns()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        telemetry.add_query(sql, time.perf_counter_ns() - start)
+
+
+def _add_query_timer(connection) -> None:
+    if time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(time_query)
+
+
+def _on_connection_created(sender, connection, **kwargs):
+    _add_query_timer(connection)
+
+
+def install_query_timer() -> None:
+    """Times queries of every db connection, current and future ones"""
+    for connection in connections.all(initialized_only=True):
+        _add_query_timer(connection)
+    connection_created.connect(
+        _on_connection_created, dispatch_uid="telemetry_query_timer"
+    )
@@ -0,0 +1,216 @@
+"""In-process caches for user lookups"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import uuid
+
+from asgiref.sync import sync_to_async
+from django.core.cache import BaseCache, caches
+from project.settings import env_setting
+from project.utils.cache import BloomFilter, TTLCache
+
+from users.models import CustomUser
+
+logger = logging.getLogger(__name__)
+
+user_token_cache = TTLCache(
+    maxsize=env_setting.AUTH_TOKEN_CACHE_SIZE,
+    ttl=env_setting.AUTH_TOKEN_CACHE_TTL,
+)
+"""Maps auth-token to its user & generation. Entries are tagged with the
+user's id"""
+
+
+def user_generations() -> BaseCache | None:
+    """Django cache shared by workers, holding the generation of each user.
+
+    A new generation is published whenever a user changes so that workers
+    drop their cached tokens of the user on next use.
+    """
+    alias = env_setting.AUTH_TOKEN_CACHE_ALIAS
+    return caches[alias] if alias else None
+
+
+def user_generation_key(user_id: int) -> str:
+    return f"users:generation:{user_id}"
+
+
+def publish_user_generation(user_id: int) -> None:
+    generations = user_generations()
+    if generations is not None:
+        generations.set(user_generation_key(user_id), uuid.uuid4().hex, None)
+
+
+async def aget_user_generation(user_id: int) -> str | None:
+    generations = user_generations()
+    if generations is None:
+        return None
+    return await generations.aget(user_generation_key(user_id))
+
+
+class UsernameIndex:
+    """Per-worker index of existing usernames.
+
+    - set   → exact, positives answered from memory.
+    - bloom → compact, positives confirmed against the db.
+
+    Kept current by CustomUser signals and reloaded in the background every
+    `refresh_interval` seconds to pick up changes made by other workers.
+    Negatives are only answered from memory when no username was added
+    since the index was loaded, as told by the generation published in the
+    `cache_alias` Django cache. Otherwise, or without a shared cache, they
+    are confirmed against the db. Until loaded, lookups fall back to the db.
+    """
+
+    generation_key = "users:usernames:generation"
+
+    def __init__(
+        self,
+        mode: str = "set",
+        refresh_interval: float = 300,
+        error_rate: float = 0.01,
+        cache_alias: str | None = None,
+    ):
+        self.mode = mode
+        self.refresh_interval = refresh_interval
+        self.error_rate = error_rate
+        self.cache_alias = cache_alias
+        self.generation: str | None = None
+        """Shared generation of usernames the index was loaded at"""
+        self.loaded_at: float | None = None
+        self.lookups = 0
+        self.db_lookups = 0
+        self.false_positives = 0
+        self._usernames: set[str] | BloomFilter | None = None
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._reload_task: asyncio.Task | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode in ("set", "bloom")
+
+    @property
+    def is_fresh(self) -> bool:
+        return (
+            self.loaded_at is not None
+            and time.monotonic() - self.loaded_at < self.refresh_interval
+        )
+
+    @property
+    def generations(self) -> BaseCache | None:
+        return caches[self.cache_alias] if self.cache_alias else None
+
+    def publish_generation(self) -> None:
+        """Tells other workers that usernames were added"""
+        if self.generations is not None:
+            self.generations.set(self.generation_key, uuid.uuid4().hex, None)
+
+    def load(self) -> None:
+        generation = None
+        if self.generations is not None:
+            # Set when missing so that its eviction reads as a change
+            self.generations.add(self.generation_key, uuid.uuid4().hex, None)
+            generation = self.generations.get(self.generation_key)
+
+        usernames = CustomUser.objects.values_list(
+            "username", flat=True
+        ).iterator()
+        if self.mode == "bloom":
+            index = BloomFilter(
+                # Leave room for new sign-ups before the next reload
+                capacity=CustomUser.objects.count() * 2 + 1000,
+                error_rate=self.error_rate,
+            )
+            for username in usernames:
+                index.add(username)
+            memory_bytes = index.memory_bytes
+        else:
+            index = set(usernames)
+            memory_bytes = sys.getsizeof(index) + sum(
+                sys.getsizeof(username) for username in index
+            )
+
+        with self._lock:
+            self._usernames = index
+            self._memory_bytes = memory_bytes
+            self.generation = generation
+            self.loaded_at = time.monotonic()
+
+        logger.info("Username index loaded - %s", self.stats())
+
+    async def aload(self) -> None:
+        if self.enabled:
+            await sync_to_async(self.load)()
+
+    def add(self, username: str) -> None:
+        with self._lock:
+            if self._usernames is not None:
+                self._usernames.add(username)
+
+    def discard(self, username: str) -> None:
+        # Bloom filters can't forget. Positives get confirmed by the db anyway
+        with self._lock:
+            if isinstance(self._usernames, set):
+                self._usernames.discard(username)
+
+    async def aexists(self, username: str) -> bool:
+        self.lookups += 1
+        if self.enabled and not self.is_fresh:
+            self._schedule_reload()
+
+        indexed = self._usernames is not None and username in self._usernames
+        if indexed and self.mode == "set":
+            return True
+        if self._usernames is not None and not indexed:
+            if await self.ais_current():
+                return False
+            self._schedule_reload()
+
+        self.db_lookups += 1
+        exists = await CustomUser.objects.filter(username=username).aexists()
+        if indexed and not exists:
+            self.false_positives += 1
+        elif exists and not indexed:
+            self.add(username)
+        return exists
+
+    async def ais_current(self) -> bool:
+        """Whether usernames added by other workers are all indexed"""
+        if self.generations is None or self.generation is None:
+            return False
+        generation = await self.generations.aget(self.generation_key)
+        return generation == self.generation
+
+    def _schedule_reload(self) -> None:
+        if self._reload_task is None or self._reload_task.done():
+            self._reload_task = asyncio.create_task(self.aload())
+
+    def stats(self) -> dict[str, int | float | str]:
+        usernames = self._usernames
+        if isinstance(usernames, BloomFilter):
+            size = usernames.count
+            false_positive_rate = usernames.false_positive_rate
+        else:
+            size = len(usernames) if usernames is not None else 0
+            false_positive_rate = 0.0
+        return {
+            "mode": self.mode,
+            "size": size,
+            "memory_bytes": self._memory_bytes,
+            "false_positive_rate": false_positive_rate,
+            "lookups": self.lookups,
+            "db_lookups": self.db_lookups,
+            "false_positives": self.false_positives,
+        }
+
+
+username_index = UsernameIndex(
+    mode=env_setting.USERNAME_INDEX_MODE,
+    refresh_interval=env_setting.USERNAME_INDEX_REFRESH_INTERVAL,
+    error_rate=env_setting.USERNAME_INDEX_ERROR_RATE,
+    cache_alias=env_setting.USERNAME_INDEX_CACHE_ALIAS,
+)
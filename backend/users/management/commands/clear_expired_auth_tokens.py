@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from users.models import AuthToken
+
+
+class Command(BaseCommand):
+    help = "Deletes expired password reset tokens in chunks"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Number of tokens deleted per query",
+        )
+
+    def handle(self, *args, **options):
+        deleted = AuthToken.delete_expired(chunk_size=options["chunk_size"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Deleted {deleted} expired auth tokens")
+        )
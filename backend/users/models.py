@@ -2,6 +2,7 @@ from django.contrib.auth.models import AbstractUser
 from django.core.validators import FileExtensionValidator, RegexValidator
 from django.db import models
 from django.utils import timezone
+from django.utils.crypto import salted_hmac
 from django.utils.translation import gettext as _
 from finance.models import UserAccount
 from project.utils import (
@@ -83,6 +84,11 @@ class CustomUser(DumpableModelMixin, AbstractUser):
         max_length=40,
         unique=True,
     )
+    token_version = models.PositiveIntegerField(
+        _("token version"),
+        help_text=_("Signed auth tokens of older versions are revoked"),
+        default=0,
+    )
     # USERNAME_FIELD = "email"
 
     REQUIRED_FIELDS = ("email",)
@@ -111,17 +117,45 @@ class CustomUser(DumpableModelMixin, AbstractUser):
 
 
 class AuthToken(DumpableModelMixin):
+    """Password reset token. Only the token's HMAC, keyed with SECRET_KEY,
+    is stored"""
+
     user = models.OneToOneField(
         CustomUser, on_delete=models.CASCADE, related_name="auth_token"
     )
-    token = models.CharField(
-        help_text=_("auth token value"), max_length=80, null=False
+    token_hash = models.CharField(
+        help_text=_("HMAC-SHA256 of the auth token value"),
+        max_length=64,
+        null=False,
+        db_index=True,
     )
     expiry_datetime = models.DateTimeField(
         help_text=_("Expiry datetime"),
         null=False,
         default=get_expiry_datetime,
+        db_index=True,
     )
 
+    @staticmethod
+    def hash_token(token: str) -> str:
+        return salted_hmac(
+            "users.AuthToken", token, algorithm="sha256"
+        ).hexdigest()
+
     def is_expired(self):
         return timezone.now() > self.expiry_datetime
+
+    @classmethod
+    def delete_expired(cls, chunk_size: int = 1000) -> int:
+        """Deletes expired tokens in chunks to keep transactions short.
+        Returns number of deleted tokens"""
+        deleted = 0
+        while True:
+            expired_ids = list(
+                cls.objects.filter(
+                    expiry_datetime__lte=timezone.now()
+                ).values_list("id", flat=True)[:chunk_size]
+            )
+            if not expired_ids:
+                return deleted
+            deleted += cls.objects.filter(id__in=expired_ids).delete()[0]
@@ -1,4 +1,9 @@
-from django.db.models.signals import pre_delete, pre_save
+from django.db.models.signals import (
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
 from django.dispatch import receiver
 from project.utils.models import (
     crop_image_to_ratio,
@@ -6,6 +11,11 @@ from project.utils.models import (
     remove_file_if_possible,
 )
 
+from users.cache import (
+    publish_user_generation,
+    user_token_cache,
+    username_index,
+)
 from users.models import DEFAULT_PROFILE, CustomUser
 
 
@@ -20,3 +30,48 @@ def crop_and_compress_profile_img(sender, instance: CustomUser, **kwargs):
         instance.profile = crop_image_to_ratio(
             instance.profile, target_width=256, target_height=256
         )
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def evict_cached_user_tokens(sender, instance: CustomUser, **kwargs):
+    # Token, password or permissions might have changed
+    user_token_cache.evict_tag(instance.pk)
+    publish_user_generation(instance.pk)
+
+
+@receiver(pre_save, sender=CustomUser)
+def remember_saved_username(
+    sender, instance: CustomUser, update_fields=None, **kwargs
+):
+    if instance._state.adding or (
+        update_fields is not None and "username" not in update_fields
+    ):
+        return
+    instance._saved_username = (
+        CustomUser.objects.filter(pk=instance.pk)
+        .values_list("username", flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=CustomUser)
+def index_username(
+    sender, instance: CustomUser, created: bool, update_fields=None, **kwargs
+):
+    username = instance.__dict__.get("username")
+    saved_username = instance.__dict__.pop("_saved_username", None)
+    if username is None or (not created and username == saved_username):
+        return
+    if update_fields is not None and "username" not in update_fields:
+        return
+
+    if saved_username is not None:
+        username_index.discard(saved_username)
+    username_index.add(username)
+    username_index.publish_generation()
+
+
+@receiver(post_delete, sender=CustomUser)
+def unindex_username(sender, instance: CustomUser, **kwargs):
+    username_index.discard(instance.__dict__.get("username"))
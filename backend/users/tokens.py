@@ -0,0 +1,116 @@
+"""User auth-tokens. Shared by the API and django views"""
+
+import copy
+import random
+import uuid
+from string import ascii_lowercase
+from typing import Any
+
+from django.core import signing
+from django.db.models import QuerySet
+from project.settings import env_setting
+
+from users.cache import aget_user_generation, user_token_cache
+from users.models import CustomUser
+
+token_id = "lms_"
+"""First characters of every user auth-token"""
+
+signed_token_id = token_id + "s_"
+"""First characters of signed user auth-token"""
+
+signed_token_salt = "api.v1.account.signed_token"
+
+
+def generate_token() -> str:
+    """Generates api token"""
+    return token_id + str(uuid.uuid4()).replace(
+        "-", random.choice(ascii_lowercase)
+    )
+
+
+def generate_signed_token(user: CustomUser) -> str:
+    """Generates api token carrying user id, issue time & token version.
+
+    Verifiable without db lookup. Revoked by incrementing
+    `user.token_version`.
+    """
+    return signed_token_id + signing.dumps(
+        [user.pk, user.token_version], salt=signed_token_salt
+    )
+
+
+def read_signed_token(token: str) -> tuple[int, int] | None:
+    """Verifies signed token and returns its (user id, token version)"""
+    try:
+        user_id, token_version = signing.loads(
+            token.removeprefix(signed_token_id),
+            salt=signed_token_salt,
+            max_age=env_setting.AUTH_SIGNED_TOKEN_MAX_AGE,
+        )
+        return user_id, token_version
+    except (signing.BadSignature, TypeError, ValueError):
+        return None
+
+
+def revoke_tokens(user: CustomUser) -> None:
+    """Invalidates user's current opaque and signed tokens. Save afterwards"""
+    user.token = generate_token()
+    user.token_version += 1
+
+
+async def aget_user_by_token(
+    token: str | None,
+    queryset: QuerySet | None = None,
+    projection: str = "user",
+) -> CustomUser | Any | None:
+    """Fetches from `queryset` the user (or user values) owning `token`.
+
+    Results are cached per `projection` name so that different callers
+    sharing a token don't overwrite each other's entries. With
+    `AUTH_TOKEN_CACHE_ALIAS` set, cached results of users changed through
+    other workers are refetched.
+    """
+    if not token:
+        return None
+
+    cache_key = (projection, token)
+    entry = user_token_cache.get(cache_key)
+    if entry is not None:
+        user, generation = entry
+        # Changed through another worker
+        if generation != await aget_user_generation(getattr(user, "pk", user)):
+            entry = None
+
+    if entry is None:
+        if queryset is None:
+            queryset = CustomUser.objects.all()
+        try:
+            if token.startswith(signed_token_id):
+                claims = read_signed_token(token)
+                if claims is None:
+                    return None
+                user_id, token_version = claims
+                user = await queryset.aget(
+                    id=user_id, token_version=token_version
+                )
+
+            elif token.startswith(token_id):
+                user = await queryset.aget(token=token)
+
+            else:
+                return None
+
+        except CustomUser.DoesNotExist:
+            return None
+
+        # Tagged by user id for eviction on change
+        user_id = getattr(user, "pk", user)
+        user_token_cache.set(
+            cache_key,
+            (user, await aget_user_generation(user_id)),
+            tag=user_id,
+        )
+
+    # Callers may mutate the user, keep the cached one intact
+    return copy.copy(user)
@@ -1,6 +1,6 @@
 import json
 
-from django.contrib.auth import login, logout
+from django.contrib.auth import alogin, alogout
 from django.contrib.auth.decorators import (
     login_not_required,
     login_required,
@@ -20,6 +20,7 @@ from django.views.generic import (
 
 from users.forms import CustomUserCreationForm, CustomUserUpdateForm
 from users.models import CustomUser
+from users.tokens import aget_user_by_token
 
 # Create your views here.
 
@@ -31,38 +32,43 @@ class Login(View):
     def dispatch(self, *args, **kwargs):
         return super().dispatch(*args, **kwargs)
 
-    def get(self, request: HttpRequest):
+    async def get(self, request: HttpRequest):
         if request.GET.get("next"):
             # Reject redirects to prevent confusing API
             return JsonResponse(
                 {"detail": "You have to login first."}, status=403
             )
         token = request.GET.get("token")
-        return self.login_user(request, token)
+        return await self.login_user(request, token)
 
-    def post(self, request: HttpRequest):
+    async def post(self, request: HttpRequest):
         token = request.POST.get("token")
-        return self.login_user(request, token)
+        return await self.login_user(request, token)
 
-    def login_user(self, request: HttpRequest, token: str) -> JsonResponse:
+    async def login_user(
+        self, request: HttpRequest, token: str
+    ) -> JsonResponse:
         if token is not None:
-            try:
-                user = CustomUser.objects.get(token=token)
-                login(request, user)
+            # Shares token cache with the API
+            user = await aget_user_by_token(token)
+            if user is not None:
+                await alogin(request, user)
                 return JsonResponse(
                     {"detail": "User authenticated successfully"}
                 )
-            except CustomUser.DoesNotExist:
-                return JsonResponse({"detail": "Invalid token"}, status=400)
+            return JsonResponse({"detail": "Invalid token"}, status=400)
         return JsonResponse(
             {"detail": "Token not provided for login"}, status=400
         )
 
 
 class Logout(View):
+    # Every method logs out, dispatch has no handlers to tell it's async
+    view_is_async = True
+
     @method_decorator(login_required)
-    def dispatch(self, request, *args, **kwargs):
-        logout(request)
+    async def dispatch(self, request, *args, **kwargs):
+        await alogout(request)
         return JsonResponse({"detail": "You have logout successfully"})
 
 
@@ -8,8 +8,9 @@ Using make:
     $ make runserver-uwsgi
 
 NOTE: This is not a good approach of running asynchronous application.
-Consider using gunicorn or the default uvicorn which are optimized for
-production purposes as well.
+Consider using gunicorn, the default uvicorn or the pre-forking
+`python -m api serve --workers N` which are optimized for production
+purposes as well.
 
 Pro: Good for 1 second fireup offering quick access of the app.
 """